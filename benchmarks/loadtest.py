@@ -0,0 +1,338 @@
+"""
+Load test for the streamable-http server
+
+Starts `uvicorn paradox_script_mcp.server:app` locally against a
+synthetic game directory, runs N concurrent MCP clients that replay a
+tool-call mix, and reports throughput, latency percentiles and the
+peak RSS of the server and its parse workers.
+
+Usage:
+    uv run python benchmarks/loadtest.py [--clients 8] [--calls 50]
+    uv run python benchmarks/loadtest.py --replay calls.jsonl
+
+A replay file has one {"tool": ..., "arguments": {...}} object per line.
+"$GAME_DIR" in string arguments is replaced with the synthetic directory.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+
+FOCUSES_PER_TREE = 40
+EVENTS_PER_FILE = 30
+
+
+def write_game_directory(root: Path, files: int) -> dict[str, list[str]]:
+    """
+    Generate a synthetic HOI4-like game directory.
+
+    Returns {relative file path: symbol names} for building call mixes.
+    """
+    symbols: dict[str, list[str]] = {}
+
+    focus_dir = root / "common" / "national_focus"
+    focus_dir.mkdir(parents=True)
+    for i in range(files):
+        ids = [f"SYN{i}_focus_{j}" for j in range(FOCUSES_PER_TREE)]
+        blocks = []
+        for j, focus_id in enumerate(ids):
+            prerequisite = f"prerequisite = {{ focus = {ids[j - 1]} }}" if j else ""
+            blocks.append(
+                f"""
+    focus = {{
+        id = {focus_id}
+        icon = GFX_goal_generic_political_reform
+        x = {j % 10}
+        y = {j // 10}
+        cost = 10
+        {prerequisite}
+        completion_reward = {{
+            add_stability = 0.05
+            add_political_power = 120
+            hidden_effect = {{
+                set_country_flag = {focus_id}_done
+                country_event = {{ id = synth{i}.1 days = 3 }}
+            }}
+        }}
+    }}"""
+            )
+        text = f"focus_tree = {{\n    id = synth_tree_{i}\n{''.join(blocks)}\n}}\n"
+        rel_path = f"common/national_focus/synth_{i}.txt"
+        (root / rel_path).write_text(text, encoding="utf-8")
+        symbols[rel_path] = ids
+
+    events_dir = root / "events"
+    events_dir.mkdir(parents=True)
+    for i in range(files):
+        ids = [f"synth{i}.{j}" for j in range(1, EVENTS_PER_FILE + 1)]
+        blocks = [
+            f"""
+country_event = {{
+    id = {event_id}
+    title = {event_id}.t
+    desc = {event_id}.d
+    trigger = {{ has_country_flag = SYN{i}_focus_0_done }}
+    option = {{
+        name = {event_id}.a
+        add_stability = 0.01
+    }}
+    option = {{
+        name = {event_id}.b
+        add_political_power = 50
+    }}
+}}"""
+            for event_id in ids
+        ]
+        text = f"add_namespace = synth{i}\n{''.join(blocks)}\n"
+        rel_path = f"events/synth_{i}.txt"
+        (root / rel_path).write_text(text, encoding="utf-8")
+        symbols[rel_path] = ids
+
+    return symbols
+
+
+def scripted_mix(
+    symbols: dict[str, list[str]], calls: int, rng: random.Random
+) -> list[tuple[str, dict]]:
+    """Drill-down sessions: list_files -> list_symbols -> get_structure (x3)"""
+    files = sorted(symbols)
+    mix: list[tuple[str, dict]] = []
+    while len(mix) < calls:
+        rel_path = rng.choice(files)
+        directory = rel_path.rsplit("/", 1)[0]
+        symbol = rng.choice(symbols[rel_path])
+        mix.append(("list_files", {"directory": directory, "limit": 20}))
+        mix.append(("list_symbols", {"file_path": rel_path}))
+        mix.append(("get_structure", {"file_path": rel_path, "symbol": symbol}))
+        if rel_path.startswith("events/"):
+            key_paths = ["option", "option[0]"]
+        else:
+            key_paths = ["completion_reward", "completion_reward.hidden_effect"]
+        for key_path in key_paths:
+            mix.append(
+                (
+                    "get_structure",
+                    {"file_path": rel_path, "symbol": symbol, "key_path": key_path},
+                )
+            )
+    return mix[:calls]
+
+
+def replay_mix(path: Path, game_dir: Path) -> list[tuple[str, dict]]:
+    """Load recorded calls, substituting $GAME_DIR"""
+    mix = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            call = json.loads(line)
+            arguments = {
+                k: v.replace("$GAME_DIR", str(game_dir)) if isinstance(v, str) else v
+                for k, v in call.get("arguments", {}).items()
+            }
+            mix.append((call["tool"], arguments))
+    return mix
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int, env: dict) -> subprocess.Popen:
+    """Start uvicorn and wait until it accepts connections"""
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "paradox_script_mcp.server:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Server exited with code {proc.returncode}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("Server did not start within 30s")
+
+
+class RssSampler:
+    """Samples the summed RSS of a process and its descendants (Linux /proc)"""
+
+    def __init__(self, pid: int, interval: float = 0.1):
+        self._pid = pid
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self.peak = 0
+
+    def __enter__(self) -> "RssSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, sum(_rss(p) for p in _process_tree(self._pid)))
+            self._stop.wait(self._interval)
+
+
+def _process_tree(pid: int) -> list[int]:
+    pids = [pid]
+    for current in pids:
+        try:
+            for task in os.listdir(f"/proc/{current}/task"):
+                with open(f"/proc/{current}/task/{task}/children") as f:
+                    pids.extend(int(child) for child in f.read().split())
+        except OSError:
+            continue
+    return pids
+
+
+def _rss(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+async def run_client(
+    url: str,
+    game_dir: Path,
+    mix: list[tuple[str, dict]],
+    latencies: dict[str, list[float]],
+    errors: dict[str, int],
+) -> None:
+    """One MCP client session: init_game, then the call mix in order"""
+    async with streamablehttp_client(url) as (read, write, _):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            calls = [("init_game", {"game_directory": str(game_dir)})] + mix
+            for tool, arguments in calls:
+                start = time.perf_counter()
+                result = await session.call_tool(tool, arguments)
+                latencies[tool].append(time.perf_counter() - start)
+                text = "".join(getattr(c, "text", "") for c in result.content)
+                if result.isError or text.startswith("Error"):
+                    errors[tool] += 1
+
+
+def percentiles(values: list[float]) -> tuple[float, float, float]:
+    """p50, p95, p99 in milliseconds"""
+    if len(values) == 1:
+        return (values[0] * 1000,) * 3
+    q = statistics.quantiles(values, n=100, method="inclusive")
+    return q[49] * 1000, q[94] * 1000, q[98] * 1000
+
+
+async def run_load(
+    args: argparse.Namespace, url: str, game_dir: Path, mixes: list
+) -> None:
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(run_client(url, game_dir, mix, latencies, errors) for mix in mixes)
+    )
+    elapsed = time.perf_counter() - start
+
+    total = sum(len(v) for v in latencies.values())
+    print(
+        f"{args.clients} clients, {total} calls in {elapsed:.2f}s "
+        f"-> {total / elapsed:.1f} calls/s"
+    )
+    print(
+        f"{'tool':<16}{'calls':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    )
+    for tool in sorted(latencies):
+        p50, p95, p99 = percentiles(latencies[tool])
+        print(
+            f"{tool:<16}{len(latencies[tool]):>8}{errors[tool]:>8}"
+            f"{p50:>10.2f}{p95:>10.2f}{p99:>10.2f}"
+        )
+    p50, p95, p99 = percentiles([v for vs in latencies.values() for v in vs])
+    print(
+        f"{'all':<16}{total:>8}{sum(errors.values()):>8}"
+        f"{p50:>10.2f}{p95:>10.2f}{p99:>10.2f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent MCP clients")
+    parser.add_argument("--calls", type=int, default=50, help="Tool calls per client")
+    parser.add_argument(
+        "--files", type=int, default=20, help="Synthetic files per directory"
+    )
+    parser.add_argument("--replay", type=Path, help="JSONL file of recorded tool calls")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="paradox-loadtest-") as tmp:
+        game_dir = Path(tmp) / "game"
+        symbols = write_game_directory(game_dir, args.files)
+
+        rng = random.Random(args.seed)
+        if args.replay:
+            recorded = replay_mix(args.replay, game_dir)
+            mixes = [recorded for _ in range(args.clients)]
+        else:
+            mixes = [
+                scripted_mix(symbols, args.calls, rng) for _ in range(args.clients)
+            ]
+
+        env = dict(os.environ, PARADOX_SCRIPT_MCP_CACHE_DIR=str(Path(tmp) / "cache"))
+        port = free_port()
+        server = start_server(port, env)
+        try:
+            with RssSampler(server.pid) as sampler:
+                asyncio.run(
+                    run_load(args, f"http://127.0.0.1:{port}/mcp", game_dir, mixes)
+                )
+            print(f"Peak RSS (server + workers): {sampler.peak / 1024**2:.1f} MiB")
+        finally:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+
+if __name__ == "__main__":
+    main()
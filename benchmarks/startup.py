@@ -0,0 +1,217 @@
+"""
+Startup benchmark for the stdio transport
+
+Measures the time from spawning the server to its first tools/list
+response, and compares it with a bare `import mcp.server.fastmcp`
+baseline, which the server cannot start faster than. A separate
+`python -X importtime` run reports the slowest imports; it is not
+timed, since importtime itself slows imports down.
+
+Exits non-zero if the median startup exceeds the baseline by more than
+the margin (or an absolute budget, if given), or if a module that
+should load lazily was imported during startup.
+
+Usage:
+    uv run python benchmarks/startup.py [--runs 10] [--margin-ms 150]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+PROTOCOL_VERSION = "2025-06-18"
+
+# Modules (and their submodules) that must not be imported before
+# the first tool call
+LAZY_MODULES = (
+    "paradox_script",
+    "yaml",
+    "paradox_script_mcp.core.cache",
+    "paradox_script_mcp.core.inventory",
+    "paradox_script_mcp.tools",
+)
+
+# Prints a line once the import is done, so interpreter teardown is not timed
+BASELINE_COMMAND = [
+    sys.executable,
+    "-c",
+    "import mcp.server.fastmcp; print('ready', flush=True)",
+]
+
+REQUESTS = [
+    {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "initialize",
+        "params": {
+            "protocolVersion": PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": {"name": "startup-benchmark", "version": "0"},
+        },
+    },
+    {"jsonrpc": "2.0", "method": "notifications/initialized"},
+    {"jsonrpc": "2.0", "id": 2, "method": "tools/list"},
+]
+
+
+def measure_once(timeout: float, importtime: bool = False) -> tuple[float, str]:
+    """
+    Start the stdio server and wait for the tools/list response.
+
+    Args:
+        timeout: Seconds before the server is killed
+        importtime: Run with -X importtime (slower; for the import profile)
+
+    Returns (milliseconds to response, stderr output).
+    """
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-m", "paradox_script_mcp.server", "--transport", "stdio"]
+    payload = "".join(json.dumps(r) + "\n" for r in REQUESTS).encode()
+
+    # importtime output is large; a file avoids filling the stderr pipe
+    with tempfile.TemporaryFile() as stderr:
+        start = time.perf_counter()
+        proc = subprocess.Popen(
+            command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=stderr
+        )
+        watchdog = threading.Timer(timeout, proc.kill)
+        watchdog.start()
+        try:
+            proc.stdin.write(payload)
+            proc.stdin.flush()
+            elapsed = None
+            for line in proc.stdout:
+                message = json.loads(line)
+                if message.get("id") == 2:
+                    elapsed = (time.perf_counter() - start) * 1000
+                    if "error" in message:
+                        raise RuntimeError(f"tools/list failed: {message['error']}")
+                    break
+            if elapsed is None:
+                raise RuntimeError("Server exited before answering tools/list")
+        finally:
+            watchdog.cancel()
+            proc.stdin.close()
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+
+        stderr.seek(0)
+        return elapsed, stderr.read().decode(errors="replace")
+
+
+def measure_baseline(timeout: float) -> float:
+    """Milliseconds for a bare interpreter to finish importing FastMCP"""
+    start = time.perf_counter()
+    proc = subprocess.Popen(BASELINE_COMMAND, stdout=subprocess.PIPE)
+    watchdog = threading.Timer(timeout, proc.kill)
+    watchdog.start()
+    try:
+        line = proc.stdout.readline()
+        elapsed = (time.perf_counter() - start) * 1000
+        if line.strip() != b"ready":
+            raise RuntimeError("Baseline import failed")
+    finally:
+        watchdog.cancel()
+        proc.stdout.close()
+        proc.wait()
+    return elapsed
+
+
+def slowest_imports(log: str, top: int | None) -> list[tuple[int, str]]:
+    """Parse -X importtime output into (cumulative us, module), slowest first"""
+    imports = []
+    for line in log.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:") :].split("|")
+        imports.append((int(cumulative), module.rstrip()))
+    imports.sort(reverse=True)
+    return imports[:top] if top is not None else imports
+
+
+def eager_lazy_imports(log: str) -> list[str]:
+    """Find LAZY_MODULES that were imported during startup"""
+    found = set()
+    for _, module in slowest_imports(log, top=None):
+        name = module.strip()
+        if any(name == m or name.startswith(m + ".") for m in LAZY_MODULES):
+            found.add(name)
+    return sorted(found)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument(
+        "--margin-ms",
+        type=float,
+        default=150.0,
+        help="Allowed median startup above the bare FastMCP import",
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=None,
+        help="Absolute median budget instead of the baseline margin",
+    )
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to show")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    # Warm-up runs fill the OS file cache and write .pyc files
+    measure_baseline(args.timeout)
+    measure_once(args.timeout)
+
+    baselines = []
+    timings = []
+    for _ in range(args.runs):
+        baselines.append(measure_baseline(args.timeout))
+        timings.append(measure_once(args.timeout)[0])
+
+    # Profile in a separate, untimed run
+    _, log = measure_once(args.timeout, importtime=True)
+    print("Slowest imports (cumulative, -X importtime run):")
+    for cumulative, module in slowest_imports(log, args.top):
+        print(f"  {cumulative / 1000:8.1f} ms  {module}")
+
+    median = statistics.median(timings)
+    baseline = statistics.median(baselines)
+    if args.budget_ms is not None:
+        budget = args.budget_ms
+        budget_desc = f"budget {budget:.0f} ms"
+    else:
+        budget = baseline + args.margin_ms
+        budget_desc = f"budget {budget:.0f} ms = baseline + {args.margin_ms:.0f} ms"
+    print()
+    print(f"Bare FastMCP import: median {baseline:.1f} ms")
+    print(
+        f"Startup to tools/list: median {median:.1f} ms "
+        f"({median - baseline:+.1f} ms), "
+        f"min {min(timings):.1f} ms, max {max(timings):.1f} ms "
+        f"({args.runs} runs, {budget_desc})"
+    )
+    failed = False
+    eager = eager_lazy_imports(log)
+    if eager:
+        print(f"FAIL: imported at startup: {', '.join(eager)}")
+        failed = True
+    if median > budget:
+        print("FAIL: startup budget exceeded")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,36 @@
 """
 Core functionality for Paradox Script MCP
+
+Cache helpers are re-exported lazily, so importing GameContext at
+server startup does not load the cache modules.
 """
 
 from paradox_script_mcp.core.game import GameContext
 
-__all__ = ["GameContext"]
+_CACHE_EXPORTS = {
+    "FileStamp",
+    "ResponseCache",
+    "cached_response",
+    "clear_caches",
+    "file_stamp",
+    "register_cache",
+}
+
+__all__ = [
+    "GameContext",
+    "FileStamp",
+    "ResponseCache",
+    "cached_response",
+    "clear_caches",
+    "file_stamp",
+    "register_cache",
+]
+
+
+def __getattr__(name: str):
+    """Import cache helpers on first access"""
+    if name in _CACHE_EXPORTS:
+        from paradox_script_mcp.core import cache
+
+        return getattr(cache, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
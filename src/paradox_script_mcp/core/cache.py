@@ -0,0 +1,202 @@
+"""
+File version stamps and caches
+
+Caches key their entries on a file's stamp, so an edited file
+misses every cache layer without explicit invalidation.
+All caches register with clear_caches() to be dropped together.
+"""
+
+import functools
+import hashlib
+import inspect
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Hashable
+
+# A file modified this recently may change again within the same mtime
+# tick, so its digest is never reused (same idea as git's "racy clean")
+RACY_WINDOW_NS = 2_000_000_000
+
+# Upper bound on the total size of cached tool responses
+RESPONSE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# Approximate per-entry overhead (key tuple, OrderedDict node)
+_ENTRY_OVERHEAD = 256
+
+# Environment variable overriding the on-disk cache directory
+CACHE_DIR_ENV = "PARADOX_SCRIPT_MCP_CACHE_DIR"
+
+
+@dataclass(frozen=True)
+class FileStamp:
+    """Version stamp of a file on disk"""
+
+    mtime_ns: int
+    size: int
+    digest: str
+
+
+# Digests keyed by path: (mtime_ns, size, inode, digest, checked_at_ns)
+_digest_memo: dict[str, tuple[int, int, int, str, int]] = {}
+
+# Clear functions of every registered cache
+_registered_caches: list[Callable[[], None]] = []
+
+
+def file_stamp(path: Path | str) -> FileStamp | None:
+    """
+    Get the current version stamp of a file.
+
+    The content digest is only recomputed when mtime, size or inode
+    changed, or when the file was modified too recently to trust mtime.
+
+    Returns None if the file cannot be read.
+    """
+    key = str(path)
+    try:
+        st = os.stat(key)
+    except OSError:
+        return None
+
+    memo = _digest_memo.get(key)
+    if (
+        memo is not None
+        and memo[:3] == (st.st_mtime_ns, st.st_size, st.st_ino)
+        and st.st_mtime_ns < memo[4] - RACY_WINDOW_NS
+    ):
+        return FileStamp(mtime_ns=st.st_mtime_ns, size=st.st_size, digest=memo[3])
+
+    try:
+        with open(key, "rb") as f:
+            digest = hashlib.file_digest(f, "blake2b").hexdigest()[:32]
+    except OSError:
+        return None
+
+    _digest_memo[key] = (st.st_mtime_ns, st.st_size, st.st_ino, digest, time.time_ns())
+    return FileStamp(mtime_ns=st.st_mtime_ns, size=st.st_size, digest=digest)
+
+
+def cache_dir() -> Path:
+    """
+    Get the directory for persisted caches.
+
+    Uses $PARADOX_SCRIPT_MCP_CACHE_DIR, else $XDG_CACHE_HOME or
+    ~/.cache, under "paradox-script-mcp".
+    """
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "paradox-script-mcp"
+
+
+def register_cache(clear: Callable[[], None]) -> None:
+    """Register a cache's clear function with clear_caches()"""
+    _registered_caches.append(clear)
+
+
+def clear_caches() -> None:
+    """Drop every registered cache and the digest memo"""
+    _digest_memo.clear()
+    for clear in _registered_caches:
+        clear()
+
+
+class ResponseCache:
+    """
+    Formatted tool responses with LRU eviction.
+
+    Bounded by the total size of cached responses in bytes.
+    """
+
+    def __init__(self, max_bytes: int = RESPONSE_CACHE_MAX_BYTES):
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, tuple[str, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> str | None:
+        """Get a cached response and mark it as recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: Hashable, response: str) -> None:
+        """Cache a response, evicting least recently used entries"""
+        size = len(response.encode("utf-8")) + _ENTRY_OVERHEAD
+        if size > self._max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (response, size)
+            self._bytes += size
+            while self._bytes > self._max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+# Global instance
+_response_cache = ResponseCache()
+register_cache(_response_cache.clear)
+
+
+def cached_response(tool: str) -> Callable:
+    """
+    Cache a file-based tool's response by arguments and file stamp.
+
+    The wrapped function must take (ctx, file_path, ...). Arguments are
+    bound to its signature with defaults applied, so positional, keyword
+    and omitted-default calls share a cache entry.
+    A hit skips parsing and formatting entirely. Error responses are
+    not cached, so timeouts are retried (and quarantined if they repeat).
+    """
+
+    def decorator(fn: Callable[..., str]) -> Callable[..., str]:
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(ctx: Any, file_path: str, *args: Any, **kwargs: Any) -> str:
+            if not ctx.is_initialized:
+                return fn(ctx, file_path, *args, **kwargs)
+
+            full_path = ctx.resolve_path(file_path)
+            stamp = file_stamp(full_path) if full_path else None
+            if stamp is None:
+                return fn(ctx, file_path, *args, **kwargs)
+
+            bound = signature.bind(ctx, file_path, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = tuple(bound.arguments.items())[2:]
+            key = (tool, file_path, arguments, stamp)
+            response = _response_cache.get(key)
+            if response is None:
+                response = fn(*bound.args, **bound.kwargs)
+                if not response.startswith("Error"):
+                    _response_cache.put(key, response)
+            return response
+
+        return wrapper
+
+    return decorator
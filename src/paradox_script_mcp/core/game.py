@@ -1,34 +1,50 @@
 """
 Game context management for Paradox Script MCP
 
-Simple path management - no caching, no indexing.
-Files are parsed on demand using paradox-script-parser.
+Simple path management and a lazily built file inventory.
+Files are parsed on demand using paradox-script-parser;
+caches keyed by file stamp live in core.cache.
 """
 
+import threading
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from paradox_script_mcp.knowledge.directory_map import load_knowledge
 
+if TYPE_CHECKING:
+    from paradox_script_mcp.core.inventory import FileInventory
+
 
 class GameContext:
     """
     Manages game directory path and knowledge.
 
-    No caching or indexing - just path management.
+    Path management plus a file inventory built once per directory.
     Files are parsed on demand when tools need them.
     """
 
     def __init__(self):
         self._game_directory: Path | None = None
         self._game_type: str | None = None
+        self._inventory: "FileInventory | None" = None
+        self._inventory_lock = threading.Lock()
 
-    def initialize(self, game_directory: str, game_type: str = "hoi4") -> None:
+    def initialize(
+        self, game_directory: str, game_type: str = "hoi4", rescan: bool = False
+    ) -> None:
         """
         Set the game directory path and load knowledge.
 
+        Re-initializing the loaded directory (e.g. one call per client on
+        a shared server) keeps the inventory and caches; cached results
+        are keyed by file stamp, so edits are still seen.
+
         Args:
             game_directory: Path to the game directory
             game_type: Game type identifier (default: "hoi4")
+            rescan: Rescan the file inventory of an already loaded
+                   directory, to see files added or removed since
         """
         path = Path(game_directory)
         if not path.exists():
@@ -36,8 +52,22 @@ class GameContext:
         if not path.is_dir():
             raise ValueError(f"Not a directory: {game_directory}")
 
-        self._game_directory = path
-        self._game_type = game_type
+        if path == self._game_directory and game_type == self._game_type:
+            if rescan:
+                with self._inventory_lock:
+                    self._inventory = None
+            return
+
+        # Imported here to keep the cache modules out of server startup
+        from paradox_script_mcp.core.cache import clear_caches
+
+        with self._inventory_lock:
+            self._game_directory = path
+            self._game_type = game_type
+            self._inventory = None
+
+        # Drop cached results from a previous game directory
+        clear_caches()
 
         # Load knowledge for this game type
         load_knowledge(game_type)
@@ -57,6 +87,22 @@ class GameContext:
         """Check if game directory is set"""
         return self._game_directory is not None
 
+    @property
+    def inventory(self) -> "FileInventory | None":
+        """
+        Get the file inventory, scanning the game directory on first use.
+
+        Returns None if the game directory is not set.
+        """
+        if not self._game_directory:
+            return None
+        with self._inventory_lock:
+            if self._inventory is None:
+                from paradox_script_mcp.core.inventory import FileInventory
+
+                self._inventory = FileInventory.build(self._game_directory)
+            return self._inventory
+
     def resolve_path(self, rel_path: str) -> Path | None:
         """
         Resolve a relative path to an absolute path.
@@ -0,0 +1,153 @@
+"""
+File inventory for a game directory
+
+Walks the game directory once with parallel os.scandir and keeps a
+sorted list of files, annotated with directory knowledge and size.
+"""
+
+import bisect
+import fnmatch
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+
+from paradox_script_mcp.knowledge.directory_map import get_directory_info
+
+# File suffixes written in Paradox script syntax
+SCRIPT_SUFFIXES = (".txt", ".gui", ".gfx")
+
+# Directory scans are I/O bound, so threads parallelize well
+SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+@dataclass(frozen=True)
+class FileEntry:
+    """A file in the inventory"""
+
+    path: str
+    size: int
+    description: str | None
+
+
+class FileInventory:
+    """
+    Sorted listing of every file under a game directory.
+
+    Built once; files added or removed afterwards are not seen
+    until the inventory is rebuilt (init_game).
+    """
+
+    def __init__(self, entries: list[FileEntry]):
+        self._entries = sorted(entries, key=lambda e: e.path)
+        self._paths = [e.path for e in self._entries]
+
+    @classmethod
+    def build(cls, root: Path | str, workers: int = SCAN_WORKERS) -> "FileInventory":
+        """
+        Scan a directory tree and build its inventory.
+
+        Args:
+            root: Game directory to scan
+            workers: Number of concurrent directory scans
+        """
+        root = str(root)
+        entries = []
+        for rel_path, size in _scan_tree(root, workers):
+            info = get_directory_info(rel_path)
+            entries.append(
+                FileEntry(
+                    path=rel_path,
+                    size=size,
+                    description=info.description if info else None,
+                )
+            )
+        return cls(entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def find(self, directory: str = "", pattern: str | None = None) -> list[FileEntry]:
+        """
+        List files under a directory, optionally filtered by glob.
+
+        Args:
+            directory: Relative directory (or path prefix) to list
+            pattern: Glob matched against the file name, or against the
+                    full relative path if it contains "/"
+
+        Returns matching entries sorted by path.
+        """
+        prefix = directory.replace("\\", "/").strip("/")
+        if prefix:
+            # A directory lists its contents; a file path lists itself
+            lo = bisect.bisect_left(self._paths, prefix)
+            if lo < len(self._paths) and self._paths[lo] == prefix:
+                entries = [self._entries[lo]]
+            else:
+                prefix += "/"
+                lo = bisect.bisect_left(self._paths, prefix)
+                hi = bisect.bisect_left(self._paths, prefix[:-1] + "0")
+                entries = self._entries[lo:hi]
+        else:
+            entries = self._entries
+
+        if pattern:
+            if "/" in pattern:
+                entries = [e for e in entries if fnmatch.fnmatchcase(e.path, pattern)]
+            else:
+                entries = [
+                    e
+                    for e in entries
+                    if fnmatch.fnmatchcase(e.path.rsplit("/", 1)[-1], pattern)
+                ]
+        return list(entries)
+
+    def script_files(self, directory: str = "") -> list[FileEntry]:
+        """List script files in known directories under a directory"""
+        return [
+            e
+            for e in self.find(directory)
+            if e.description is not None and e.path.endswith(SCRIPT_SUFFIXES)
+        ]
+
+
+def _scan_tree(root: str, workers: int) -> list[tuple[str, int]]:
+    """
+    Recursively list files with parallel os.scandir.
+
+    Returns (relative path, size) tuples in no particular order.
+    """
+    files: list[tuple[str, int]] = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(_scan_dir, root, "")}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                dir_files, subdirs = future.result()
+                files.extend(dir_files)
+                for abs_dir, rel_dir in subdirs:
+                    pending.add(pool.submit(_scan_dir, abs_dir, rel_dir))
+    return files
+
+
+def _scan_dir(
+    abs_dir: str, rel_dir: str
+) -> tuple[list[tuple[str, int]], list[tuple[str, str]]]:
+    """List files and subdirectories of a single directory"""
+    files: list[tuple[str, int]] = []
+    subdirs: list[tuple[str, str]] = []
+    try:
+        with os.scandir(abs_dir) as it:
+            for entry in it:
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append((entry.path, rel_path))
+                    elif entry.is_file():
+                        files.append((rel_path, entry.stat().st_size))
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return files, subdirs
@@ -0,0 +1,499 @@
+"""
+Block-level Merkle hashes of a game directory
+
+Each symbol (focus, event, decision, ...) gets a content hash of its
+normalized parsed block. Symbol hashes roll up into file hashes and
+file hashes into directory hashes, so two versions are compared by
+descending only into subtrees whose hashes differ.
+
+Snapshots are persisted under the cache directory and reused per file
+while its stamp digest (core.cache.file_stamp) is unchanged.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+from paradox_script_mcp.core.cache import cache_dir, file_stamp, register_cache
+from paradox_script_mcp.core.inventory import FileInventory
+from paradox_script_mcp.core.workers import WorkerError, parse_pool
+
+# Bump when hashing or the snapshot layout changes
+SNAPSHOT_FORMAT = 2
+
+# Names of saved snapshots: no path separators, no leading dot
+SNAPSHOT_NAME = re.compile(r"[A-Za-z0-9_][A-Za-z0-9_.-]*")
+
+DIGEST_SIZE = 12
+
+# Key paths inside a symbol whose hashes are kept, to report what changed
+KEY_PATH_DEPTH = 2
+
+# Symbols nested in other symbols: parent key -> child key.
+# The children are hashed on their own and excluded from the parent.
+NESTED_SYMBOLS = {"focus_tree": "focus"}
+
+
+@dataclass
+class SymbolHash:
+    """Content hash of a symbol and of its key paths"""
+
+    digest: str
+    key_paths: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class FileHashes:
+    """Hashes of a file's symbols, rolled up into a file digest"""
+
+    # Content digest of the file (FileStamp.digest) the hashes were built
+    # from; None for placeholders that must be rebuilt next time
+    stamp: str | None
+    digest: str
+    symbols: dict[str, SymbolHash] = field(default_factory=dict)
+    error: str | None = None
+
+
+@dataclass
+class _DirNode:
+    """Directory level of the Merkle tree"""
+
+    digest: str = ""
+    dirs: dict[str, "_DirNode"] = field(default_factory=dict)
+    files: dict[str, tuple[str, FileHashes]] = field(default_factory=dict)
+
+    def all_files(self) -> Iterator[tuple[str, FileHashes]]:
+        """Iterate (relative path, hashes) of every file below this node"""
+        yield from self.files.values()
+        for child in self.dirs.values():
+            yield from child.all_files()
+
+    def file_count(self) -> int:
+        return len(self.files) + sum(d.file_count() for d in self.dirs.values())
+
+
+class MerkleSnapshot:
+    """Merkle tree of the script files of one game version"""
+
+    def __init__(self, root: str, files: dict[str, FileHashes]):
+        self.root = root
+        self.files = files
+        self.tree = _build_tree(files)
+
+    @property
+    def digest(self) -> str:
+        return self.tree.digest
+
+    def save(self, path: Path | str) -> None:
+        """Write the snapshot as JSON (atomically)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "format": SNAPSHOT_FORMAT,
+            "root": self.root,
+            "files": {
+                rel_path: {
+                    "stamp": f.stamp,
+                    "digest": f.digest,
+                    "error": f.error,
+                    "symbols": {
+                        name: [s.digest, s.key_paths] for name, s in f.symbols.items()
+                    },
+                }
+                for rel_path, f in self.files.items()
+            },
+        }
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path | str) -> "MerkleSnapshot":
+        """
+        Read a snapshot written by save().
+
+        Raises ValueError if the file is not a snapshot of this format.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or data.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"Not a snapshot (format {SNAPSHOT_FORMAT}): {path}")
+
+        files = {
+            rel_path: FileHashes(
+                stamp=f["stamp"],
+                digest=f["digest"],
+                error=f.get("error"),
+                symbols={
+                    name: SymbolHash(digest=s[0], key_paths=s[1])
+                    for name, s in f["symbols"].items()
+                },
+            )
+            for rel_path, f in data["files"].items()
+        }
+        return cls(data["root"], files)
+
+
+# Snapshots built in this process, keyed by resolved root directory
+_snapshots: dict[str, MerkleSnapshot] = {}
+_snapshots_lock = threading.Lock()
+register_cache(_snapshots.clear)
+
+
+def snapshot_path(root: Path | str) -> Path:
+    """Path of the persisted snapshot for a game directory"""
+    key = hashlib.blake2b(str(root).encode("utf-8"), digest_size=8).hexdigest()
+    return cache_dir() / "merkle" / f"{key}.json"
+
+
+def named_snapshot_path(name: str) -> Path:
+    """
+    Path of a snapshot saved under a name.
+
+    Names are confined to the snapshots cache directory.
+
+    Raises ValueError for names that could escape it.
+    """
+    if not SNAPSHOT_NAME.fullmatch(name) or ".." in name:
+        raise ValueError(
+            f"Invalid snapshot name: {name!r} "
+            "(use letters, digits, '_', '-' and '.', e.g. \"hoi4-1.14\")"
+        )
+    return cache_dir() / "snapshots" / f"{name}.json"
+
+
+def load_or_build(
+    root: Path | str, inventory: FileInventory | None = None
+) -> MerkleSnapshot:
+    """
+    Get an up-to-date snapshot of a game directory.
+
+    Starts from the in-memory or persisted snapshot and only re-hashes
+    files whose stamp changed, then persists the result.
+
+    Args:
+        root: Game directory
+        inventory: The directory's file inventory, if already built
+    """
+    root = str(Path(root).resolve())
+    with _snapshots_lock:
+        previous = _snapshots.get(root)
+        persisted = snapshot_path(root)
+        if previous is None and persisted.exists():
+            try:
+                previous = MerkleSnapshot.load(persisted)
+            except (OSError, ValueError, KeyError):
+                previous = None
+
+        snapshot = build_snapshot(root, previous, inventory)
+        if snapshot is not previous:
+            snapshot.save(persisted)
+        _snapshots[root] = snapshot
+        return snapshot
+
+
+def build_snapshot(
+    root: Path | str,
+    previous: MerkleSnapshot | None = None,
+    inventory: FileInventory | None = None,
+) -> MerkleSnapshot:
+    """
+    Hash the script files in the known directories of a game directory.
+
+    Files whose stamp digest matches previous are not re-parsed.
+    If nothing changed, previous is returned as is.
+
+    Args:
+        root: Game directory
+        previous: Earlier snapshot of the same directory
+        inventory: The directory's file inventory; scanned if not given
+    """
+    root = str(root)
+    old_files = previous.files if previous else {}
+    if inventory is None:
+        inventory = FileInventory.build(root)
+
+    files: dict[str, FileHashes] = {}
+    pending: list[tuple[str, str, str]] = []
+    for entry in inventory.script_files():
+        full_path = os.path.join(root, entry.path)
+        stamp = file_stamp(full_path)
+        if stamp is None:
+            continue
+        old = old_files.get(entry.path)
+        if old and old.stamp == stamp.digest:
+            files[entry.path] = old
+        else:
+            pending.append((entry.path, full_path, stamp.digest))
+
+    if previous is not None and not pending and files.keys() == old_files.keys():
+        return previous
+
+    results = parse_pool().map(hash_file, [full_path for _, full_path, _ in pending])
+    for (rel_path, full_path, stamp), result in zip(pending, results):
+        if isinstance(result, WorkerError):
+            # Timeouts, crashes and quarantine say nothing about the content:
+            # keep the last good hashes, else store a placeholder without a
+            # stamp, so either way the file is retried next time
+            old = old_files.get(rel_path)
+            if old is not None:
+                files[rel_path] = FileHashes(
+                    stamp=None,
+                    digest=old.digest,
+                    symbols=old.symbols,
+                    error=old.error,
+                )
+                continue
+            stamp = None
+            result = _error_hashes(full_path, str(result))
+        digest, symbols, error = result
+        files[rel_path] = FileHashes(
+            stamp=stamp,
+            digest=digest,
+            symbols=symbols,
+            error=error,
+        )
+
+    return MerkleSnapshot(root, files)
+
+
+def hash_file(path: str) -> tuple[str, dict[str, SymbolHash], str | None]:
+    """
+    Parse a file and hash its symbols (runs in a worker).
+
+    Returns (file digest, symbol hashes, parse error). A file that
+    fails to parse is hashed by its raw content instead.
+    """
+    from paradox_script.parser import parse_save_file
+
+    try:
+        data = parse_save_file(path)
+        raw_data = _unwrap(data)
+        if not isinstance(raw_data, dict):
+            raise ValueError(f"Expected dict, got {type(raw_data).__name__}")
+        symbols = {}
+        for name, value in _iter_symbols(raw_data):
+            key_paths: dict[str, str] = {}
+            digest = _hash_node(value, "", 0, key_paths)
+            symbols[_unique_name(symbols, name)] = SymbolHash(digest, key_paths)
+    except Exception as e:
+        return _error_hashes(path, f"{type(e).__name__}: {e}".splitlines()[0][:120])
+
+    return _combine(sorted((n, s.digest) for n, s in symbols.items())), symbols, None
+
+
+def _error_hashes(path: str, message: str) -> tuple[str, dict, str]:
+    """Hash a file that could not be parsed by its raw content"""
+    try:
+        with open(path, "rb") as f:
+            content = hashlib.file_digest(f, "blake2b").hexdigest()
+    except OSError:
+        content = ""
+    return _combine([("error", content)]), {}, message
+
+
+def _iter_symbols(raw_data: dict) -> Iterator[tuple[str, Any]]:
+    """
+    Yield (name, block) for each symbol in a file.
+
+    Follows get_structure's lookup: blocks are named by their id when
+    they have one, else by key (with an index for repeated keys).
+    """
+    for key, value in raw_data.items():
+        value_data = _unwrap(value)
+        if isinstance(value_data, list) and any(
+            isinstance(_unwrap(item), dict) for item in value_data
+        ):
+            items = [(f"{key}[{i}]", item) for i, item in enumerate(value_data)]
+        else:
+            items = [(key, value)]
+
+        nested_key = NESTED_SYMBOLS.get(key)
+        for fallback, item in items:
+            item_data = _unwrap(item)
+            name = fallback
+            if isinstance(item_data, dict) and isinstance(item_data.get("id"), str):
+                name = item_data["id"]
+
+            if nested_key and isinstance(item_data, dict) and nested_key in item_data:
+                yield name, {k: v for k, v in item_data.items() if k != nested_key}
+                yield from _iter_symbols({nested_key: item_data[nested_key]})
+            else:
+                yield name, item
+
+
+def _unique_name(symbols: dict, name: str) -> str:
+    """Disambiguate duplicate symbol names with a #N suffix"""
+    if name not in symbols:
+        return name
+    n = 2
+    while f"{name}#{n}" in symbols:
+        n += 1
+    return f"{name}#{n}"
+
+
+def _hash_node(value: Any, path: str, depth: int, key_paths: dict[str, str]) -> str:
+    """
+    Hash a normalized parsed value, bottom-up.
+
+    Key order is kept (effects run in order). Integral floats hash
+    like ints, so "1" and "1.0" are equal. Hashes of key paths up to
+    KEY_PATH_DEPTH are recorded in key_paths.
+    """
+    value = _unwrap(value)
+    h = hashlib.blake2b(digest_size=DIGEST_SIZE)
+
+    if isinstance(value, dict):
+        h.update(b"{")
+        for key, child in value.items():
+            child_path = f"{path}.{key}" if path else str(key)
+            _update_framed(h, str(key))
+            h.update(_hash_node(child, child_path, depth + 1, key_paths).encode())
+    elif isinstance(value, list):
+        h.update(b"[")
+        for i, item in enumerate(value):
+            h.update(_hash_node(item, f"{path}[{i}]", depth, key_paths).encode())
+    elif isinstance(value, bool):
+        h.update(b"b1" if value else b"b0")
+    elif isinstance(value, (int, float)):
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        _update_framed(h, f"n{value!r}")
+    else:
+        _update_framed(h, f"s{value}")
+
+    digest = h.hexdigest()
+    # Record keys and indexed blocks, not items of scalar lists
+    if (
+        path
+        and depth <= KEY_PATH_DEPTH
+        and (not path.endswith("]") or isinstance(value, (dict, list)))
+    ):
+        key_paths[path] = digest
+    return digest
+
+
+def _update_framed(h: Any, text: str) -> None:
+    """Feed length-prefixed text so adjacent fields cannot run together"""
+    data = text.encode("utf-8")
+    h.update(f"{len(data)}:".encode())
+    h.update(data)
+
+
+def _combine(children: list[tuple[str, str]]) -> str:
+    """Merkle hash of named child digests"""
+    h = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    for name, digest in children:
+        _update_framed(h, name)
+        h.update(digest.encode())
+    return h.hexdigest()
+
+
+def _unwrap(value: Any) -> Any:
+    return value._data if hasattr(value, "_data") else value
+
+
+def _build_tree(files: dict[str, FileHashes]) -> _DirNode:
+    """Arrange file hashes into directories and roll up the digests"""
+    root = _DirNode()
+    for rel_path, hashes in files.items():
+        *dirs, name = rel_path.split("/")
+        node = root
+        for part in dirs:
+            node = node.dirs.setdefault(part, _DirNode())
+        node.files[name] = (rel_path, hashes)
+    _roll_up(root)
+    return root
+
+
+def _roll_up(node: _DirNode) -> str:
+    children = [(f"{name}/", _roll_up(child)) for name, child in node.dirs.items()]
+    children += [(name, hashes.digest) for name, (_, hashes) in node.files.items()]
+    node.digest = _combine(sorted(children))
+    return node.digest
+
+
+@dataclass
+class FileDiff:
+    """Symbol-level changes in a file present in both versions"""
+
+    path: str
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    modified: list[tuple[str, list[str]]] = field(default_factory=list)
+    error: str | None = None
+
+
+@dataclass
+class VersionDiff:
+    """Differences between two snapshots"""
+
+    added_files: list[tuple[str, FileHashes]] = field(default_factory=list)
+    removed_files: list[tuple[str, FileHashes]] = field(default_factory=list)
+    modified_files: list[FileDiff] = field(default_factory=list)
+    unchanged_files: int = 0
+
+
+def diff_snapshots(base: MerkleSnapshot, other: MerkleSnapshot) -> VersionDiff:
+    """Compare two snapshots, skipping subtrees with equal hashes"""
+    diff = VersionDiff()
+    _diff_dirs(base.tree, other.tree, diff)
+    diff.added_files.sort(key=lambda f: f[0])
+    diff.removed_files.sort(key=lambda f: f[0])
+    diff.modified_files.sort(key=lambda f: f.path)
+    return diff
+
+
+def _diff_dirs(a: _DirNode, b: _DirNode, diff: VersionDiff) -> None:
+    if a.digest == b.digest:
+        diff.unchanged_files += a.file_count()
+        return
+
+    for name in a.dirs.keys() | b.dirs.keys():
+        if name not in b.dirs:
+            diff.removed_files.extend(a.dirs[name].all_files())
+        elif name not in a.dirs:
+            diff.added_files.extend(b.dirs[name].all_files())
+        else:
+            _diff_dirs(a.dirs[name], b.dirs[name], diff)
+
+    for name in a.files.keys() | b.files.keys():
+        if name not in b.files:
+            diff.removed_files.append(a.files[name])
+        elif name not in a.files:
+            diff.added_files.append(b.files[name])
+        elif a.files[name][1].digest == b.files[name][1].digest:
+            diff.unchanged_files += 1
+        else:
+            rel_path = a.files[name][0]
+            diff.modified_files.append(
+                _diff_file(rel_path, a.files[name][1], b.files[name][1])
+            )
+
+
+def _diff_file(rel_path: str, a: FileHashes, b: FileHashes) -> FileDiff:
+    file_diff = FileDiff(path=rel_path, error=b.error)
+    for name in b.symbols:
+        if name not in a.symbols:
+            file_diff.added.append(name)
+    for name, symbol in a.symbols.items():
+        if name not in b.symbols:
+            file_diff.removed.append(name)
+        elif symbol.digest != b.symbols[name].digest:
+            changed = _changed_key_paths(symbol.key_paths, b.symbols[name].key_paths)
+            file_diff.modified.append((name, changed))
+    return file_diff
+
+
+def _changed_key_paths(a: dict[str, str], b: dict[str, str]) -> list[str]:
+    """Most specific key paths whose hashes differ"""
+    changed = sorted(p for p in a.keys() | b.keys() if a.get(p) != b.get(p))
+    return [
+        p for p in changed if not any(q.startswith((f"{p}.", f"{p}[")) for q in changed)
+    ]
@@ -0,0 +1,352 @@
+"""
+Supervised parse workers
+
+Parsing runs in worker processes, so a pathological file cannot stall
+or exhaust the server process everyone shares. Each task has a timeout,
+workers have a memory cap and are recycled when they grow too large,
+and files that keep failing are quarantined until they change.
+"""
+
+import os
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterator
+
+from paradox_script_mcp.core.cache import FileStamp, file_stamp, register_cache
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Seconds a single file may take before its worker is killed
+PARSE_TIMEOUT = 30.0
+
+# Hard address-space cap per worker; allocations beyond it raise MemoryError
+WORKER_MEMORY_LIMIT = 4 * 1024**3
+
+# Workers are recycled after a task leaves them above this RSS...
+WORKER_RSS_LIMIT = 1024**3
+
+# ...or after this many tasks
+WORKER_MAX_TASKS = 500
+
+# Failures (errors, timeouts, crashes) before a file is quarantined
+QUARANTINE_STRIKES = 2
+
+POOL_SIZE = max(1, min(4, os.cpu_count() or 1))
+
+
+class WorkerError(Exception):
+    """A task failed, timed out or crashed its worker"""
+
+
+class QuarantinedError(WorkerError):
+    """A file is quarantined after repeated failures"""
+
+
+class _Worker:
+    """
+    A worker process and the parent's end of its pipe.
+
+    On POSIX the worker is a fresh `python -m paradox_script_mcp.core.workers`
+    that inherits its end of the pipe. multiprocessing's spawn (and
+    forkserver) would re-import the parent's __main__, i.e. the server
+    and FastMCP, in every worker. Windows cannot pass the pipe that way,
+    so it falls back to spawn.
+    """
+
+    def __init__(self, mp_context: Any, memory_limit: int):
+        self.conn, child_conn = mp_context.Pipe()
+        if os.name == "posix":
+            fd = child_conn.fileno()
+            env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+            self.process = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "paradox_script_mcp.core.workers",
+                    str(fd),
+                    str(memory_limit),
+                ],
+                # stdout belongs to the stdio transport from the first byte
+                stdin=subprocess.DEVNULL,
+                stdout=_stderr_target(),
+                pass_fds=(fd,),
+                env=env,
+            )
+        else:
+            self.process = mp_context.Process(
+                target=_spawned_worker_main,
+                args=(child_conn, memory_limit),
+                daemon=True,
+            )
+            self.process.start()
+        child_conn.close()
+        self.tasks = 0
+
+    def is_alive(self) -> bool:
+        if isinstance(self.process, subprocess.Popen):
+            return self.process.poll() is None
+        return self.process.is_alive()
+
+    def exitcode(self, timeout: float = 1) -> int | None:
+        """Wait up to timeout for the process to exit; None if still running"""
+        if isinstance(self.process, subprocess.Popen):
+            try:
+                return self.process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                return None
+        self.process.join(timeout=timeout)
+        return self.process.exitcode
+
+    def kill(self) -> None:
+        if self.is_alive():
+            self.process.kill()
+        self.exitcode(timeout=1)
+        self.conn.close()
+
+
+def _stderr_target() -> Any:
+    """Where worker stdout goes: the server's stderr, else nowhere"""
+    try:
+        return sys.stderr.fileno()
+    except (OSError, ValueError, AttributeError):
+        return subprocess.DEVNULL
+
+
+def _spawned_worker_main(conn: Any, memory_limit: int) -> None:
+    """Entry point of spawn workers, which inherit the server's stdout"""
+    # stdout belongs to the stdio transport; send stray output to stderr
+    try:
+        os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    except (OSError, ValueError, AttributeError):
+        pass
+    sys.stdout = sys.stderr
+    _worker_main(conn, memory_limit)
+
+
+def _worker_main(conn: Any, memory_limit: int) -> None:
+    """Worker loop: run (fn, args) tasks until the pipe closes"""
+    if resource is not None and memory_limit:
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+        except (OSError, ValueError):
+            pass
+
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+
+        fn, args = task
+        try:
+            reply = ("ok", fn(*args))
+        except MemoryError:
+            reply = ("fatal", "MemoryError: worker memory limit exceeded")
+        except Exception as e:
+            reply = ("error", f"{type(e).__name__}: {e}".splitlines()[0][:200])
+        conn.send((*reply, _rss_bytes()))
+
+
+def _rss_bytes() -> int:
+    """Current resident set size of this process (0 if unknown)"""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    if resource is not None:
+        # Peak rather than current RSS; KiB on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    return 0
+
+
+class ParsePool:
+    """
+    Pool of supervised worker processes.
+
+    Workers start on first use and are reused across tasks.
+    """
+
+    def __init__(
+        self,
+        size: int = POOL_SIZE,
+        timeout: float = PARSE_TIMEOUT,
+        memory_limit: int = WORKER_MEMORY_LIMIT,
+        rss_limit: int = WORKER_RSS_LIMIT,
+        max_tasks: int = WORKER_MAX_TASKS,
+    ):
+        import multiprocessing
+
+        # Pipes only, plus spawn on Windows; never fork a threaded server
+        self._mp_context = multiprocessing.get_context("spawn")
+        self.size = size
+        self.timeout = timeout
+        self._memory_limit = memory_limit
+        self._rss_limit = rss_limit
+        self._max_tasks = max_tasks
+
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle: list[_Worker] = []
+        self._lock = threading.Lock()
+
+        # path -> (stamp, failure count, last error)
+        self._strikes: dict[str, tuple[FileStamp | None, int, str]] = {}
+
+    def run(self, fn: Callable[..., Any], path: str, *args: Any) -> Any:
+        """
+        Run fn(path, *args) in a worker.
+
+        fn must be a module-level function; its result must be picklable.
+
+        Raises:
+            QuarantinedError: The file failed too often; it is retried
+                once its content changes.
+            WorkerError: fn raised, timed out or crashed the worker.
+        """
+        stamp = file_stamp(path)
+        with self._lock:
+            strike = self._strikes.get(path)
+        if strike and strike[0] == stamp and strike[1] >= QUARANTINE_STRIKES:
+            raise QuarantinedError(
+                f"Quarantined after {strike[1]} failures ({strike[2]}); "
+                "edit the file to retry"
+            )
+
+        try:
+            result = self._execute(fn, (path, *args))
+        except WorkerError as e:
+            self._strike(path, stamp, str(e))
+            raise
+
+        with self._lock:
+            self._strikes.pop(path, None)
+        return result
+
+    def map(
+        self, fn: Callable[[str], Any], paths: list[str]
+    ) -> Iterator[Any | WorkerError]:
+        """
+        Run fn(path) for each path, yielding results in order.
+
+        Failures are yielded as WorkerError instances, not raised.
+        """
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            futures = [executor.submit(self._run_catching, fn, p) for p in paths]
+            for future in futures:
+                yield future.result()
+
+    def quarantined(self) -> list[tuple[str, str]]:
+        """List quarantined (path, last error)"""
+        with self._lock:
+            return sorted(
+                (path, error)
+                for path, (_, count, error) in self._strikes.items()
+                if count >= QUARANTINE_STRIKES
+            )
+
+    def clear_quarantine(self) -> None:
+        with self._lock:
+            self._strikes.clear()
+
+    def shutdown(self) -> None:
+        """Stop idle workers (busy workers stop when their pipe closes)"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.kill()
+
+    def _run_catching(self, fn: Callable[[str], Any], path: str) -> Any:
+        try:
+            return self.run(fn, path)
+        except WorkerError as e:
+            return e
+
+    def _execute(self, fn: Callable[..., Any], args: tuple) -> Any:
+        self._slots.acquire()
+        worker = None
+        try:
+            worker = self._acquire_worker()
+            try:
+                worker.conn.send((fn, args))
+                if not worker.conn.poll(self.timeout):
+                    raise WorkerError(f"Timed out after {self.timeout:g}s")
+                status, result, rss = worker.conn.recv()
+            except (EOFError, OSError) as e:
+                exitcode = worker.exitcode(timeout=1)
+                raise WorkerError(
+                    f"Worker crashed (exit code {exitcode})"
+                    if exitcode is not None
+                    else f"Worker connection lost ({type(e).__name__})"
+                ) from e
+            except WorkerError:
+                raise
+            except Exception as e:
+                # e.g. the result could not be pickled/unpickled
+                raise WorkerError(f"{type(e).__name__}: {e}") from e
+
+            worker.tasks += 1
+            if (
+                status != "fatal"
+                and rss <= self._rss_limit
+                and worker.tasks < self._max_tasks
+            ):
+                self._release_worker(worker)
+                worker = None
+
+            if status != "ok":
+                raise WorkerError(result)
+            return result
+        finally:
+            if worker is not None:
+                # Timed out, crashed, out of memory or due for recycling
+                worker.kill()
+            self._slots.release()
+
+    def _acquire_worker(self) -> _Worker:
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.is_alive():
+                    return worker
+                worker.kill()
+        return _Worker(self._mp_context, self._memory_limit)
+
+    def _release_worker(self, worker: _Worker) -> None:
+        with self._lock:
+            self._idle.append(worker)
+
+    def _strike(self, path: str, stamp: FileStamp | None, error: str) -> None:
+        with self._lock:
+            old = self._strikes.get(path)
+            count = old[1] + 1 if old and old[0] == stamp else 1
+            self._strikes[path] = (stamp, count, error)
+
+
+# Global instance, created on first use
+_pool: ParsePool | None = None
+_pool_lock = threading.Lock()
+
+
+def parse_pool() -> ParsePool:
+    """Get the shared parse pool"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ParsePool()
+            register_cache(_pool.clear_quarantine)
+        return _pool
+
+
+if __name__ == "__main__":
+    from multiprocessing.connection import Connection
+
+    # python -m paradox_script_mcp.core.workers <pipe fd> <memory limit>
+    _worker_main(Connection(int(sys.argv[1])), int(sys.argv[2]))
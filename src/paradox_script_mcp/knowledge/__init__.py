@@ -6,6 +6,7 @@ from paradox_script_mcp.knowledge.directory_map import (
     DirectoryInfo,
     load_knowledge,
     get_directory_info,
+    match_directory,
     list_directories,
     is_knowledge_loaded,
 )
@@ -14,6 +15,7 @@ __all__ = [
     "DirectoryInfo",
     "load_knowledge",
     "get_directory_info",
+    "match_directory",
     "list_directories",
     "is_knowledge_loaded",
 ]
@@ -7,8 +7,6 @@ Loads directory knowledge from YAML files based on game type.
 from dataclasses import dataclass
 from pathlib import Path
 
-import yaml
-
 
 @dataclass
 class DirectoryInfo:
@@ -17,6 +15,37 @@ class DirectoryInfo:
     description: str
 
 
+class _PathTrie:
+    """
+    Path prefixes stored by segment.
+
+    Lookup walks one node per path segment, so matching the most
+    specific prefix does not scan every configured directory.
+    """
+
+    def __init__(self):
+        self._children: dict[str, "_PathTrie"] = {}
+        self._key: str | None = None
+
+    def insert(self, path: str) -> None:
+        node = self
+        for segment in path.strip("/").split("/"):
+            node = node._children.setdefault(segment, _PathTrie())
+        node._key = path
+
+    def longest_prefix(self, path: str) -> str | None:
+        """Get the longest inserted path that is a prefix of path"""
+        node = self
+        best: str | None = None
+        for segment in path.strip("/").split("/"):
+            node = node._children.get(segment)
+            if node is None:
+                break
+            if node._key is not None:
+                best = node._key
+        return best
+
+
 class DirectoryKnowledge:
     """
     Manages directory knowledge for a specific game.
@@ -26,6 +55,7 @@ class DirectoryKnowledge:
 
     def __init__(self):
         self._directories: dict[str, DirectoryInfo] = {}
+        self._trie = _PathTrie()
         self._game: str | None = None
 
     @property
@@ -49,31 +79,40 @@ class DirectoryKnowledge:
         if not yml_path.exists():
             raise FileNotFoundError(f"Knowledge file not found: {yml_path}")
 
+        # Imported lazily to keep server startup fast
+        import yaml
+
         with open(yml_path, "r", encoding="utf-8") as f:
             data = yaml.safe_load(f)
 
         self._directories = {}
+        self._trie = _PathTrie()
         for path, info in data.get("directories", {}).items():
             self._directories[path] = DirectoryInfo(
                 description=info.get("description", ""),
             )
+            self._trie.insert(path)
 
         self._game = game
 
+    def match(self, rel_path: str) -> str | None:
+        """
+        Find the most specific known directory prefix for a path.
+
+        Prefixes match whole path segments ("events" does not match
+        "events_extra/foo.txt").
+
+        Returns the matching directory key, or None if no prefix matches.
+        """
+        return self._trie.longest_prefix(rel_path.replace("\\", "/"))
+
     def get_info(self, rel_path: str) -> DirectoryInfo | None:
         """
         Get directory information for a given path.
 
         Matches the most specific directory prefix.
         """
-        rel_path = rel_path.replace("\\", "/")
-
-        best_match: str | None = None
-        for dir_path in self._directories:
-            if rel_path.startswith(dir_path):
-                if best_match is None or len(dir_path) > len(best_match):
-                    best_match = dir_path
-
+        best_match = self.match(rel_path)
         if best_match:
             return self._directories[best_match]
         return None
@@ -103,6 +142,11 @@ def get_directory_info(rel_path: str) -> DirectoryInfo | None:
     return _knowledge.get_info(rel_path)
 
 
+def match_directory(rel_path: str) -> str | None:
+    """Get the most specific known directory containing a path."""
+    return _knowledge.match(rel_path)
+
+
 def list_directories() -> list[tuple[str, str]]:
     """List all known directories with descriptions."""
     return _knowledge.list_all()
@@ -3,14 +3,21 @@ Paradox Script MCP Server
 
 Main entry point for the MCP server.
 Provides tools for efficient discovery of HOI4 game scripts.
+
+Tool implementations (and through them the parser and yaml) are
+imported on first use, so a per-session stdio server starts fast.
+
+Tools run in worker threads: parses can wait on a worker process for
+up to the parse timeout, and must not block the event loop every
+client shares.
 """
 
+import argparse
+
+from anyio import to_thread
 from mcp.server.fastmcp import FastMCP
 
 from paradox_script_mcp.core.game import GameContext
-from paradox_script_mcp.tools.explore import list_directories_tool
-from paradox_script_mcp.tools.symbols import list_symbols_tool
-from paradox_script_mcp.tools.structure import get_structure_tool
 
 # Global game context instance
 _ctx = GameContext()
@@ -20,29 +27,32 @@ mcp = FastMCP("paradox-script")
 
 
 @mcp.tool()
-def init_game(game_directory: str) -> str:
+async def init_game(game_directory: str, rescan: bool = False) -> str:
     """
     Initialize the MCP server with a HOI4 game directory.
 
     This sets the game directory path for subsequent operations.
-    Call this first before using other tools.
+    Call this first before using other tools. Calling it again with the
+    same directory keeps the file list; pass rescan=True after adding
+    or removing files.
 
     Args:
         game_directory: Path to the HOI4 game directory
                        (e.g., "/path/to/Hearts of Iron IV")
+        rescan: Rescan the file list of an already initialized directory
 
     Returns:
         Status message confirming initialization.
     """
     try:
-        _ctx.initialize(game_directory)
+        await to_thread.run_sync(_ctx.initialize, game_directory, "hoi4", rescan)
         return f"Initialized: {game_directory}"
     except Exception as e:
         return f"Error initializing: {e}"
 
 
 @mcp.tool()
-def list_directories() -> str:
+async def list_directories() -> str:
     """
     List all known script directories and their purposes.
 
@@ -52,11 +62,44 @@ def list_directories() -> str:
     Returns:
         List of directories with their purposes in Japanese.
     """
-    return list_directories_tool()
+    from paradox_script_mcp.tools.explore import list_directories_tool
+
+    return await to_thread.run_sync(list_directories_tool)
 
 
 @mcp.tool()
-def list_symbols(file_path: str) -> str:
+async def list_files(
+    directory: str = "",
+    pattern: str | None = None,
+    offset: int = 0,
+    limit: int = 100,
+) -> str:
+    """
+    List files in a directory, with sizes and directory purposes.
+
+    Use this to find exact file names instead of guessing them.
+    The file list is scanned once per init_game and served from memory.
+
+    Args:
+        directory: Relative directory to list
+                  (e.g., "common/on_actions"; default: whole game directory)
+        pattern: Optional glob on file names (e.g., "*aat*.txt"),
+                or on relative paths if it contains "/"
+        offset: Number of matching files to skip (for pagination)
+        limit: Maximum number of files to return (max 500)
+
+    Returns:
+        Paginated list of relative file paths with sizes.
+    """
+    from paradox_script_mcp.tools.files import list_files_tool
+
+    return await to_thread.run_sync(
+        list_files_tool, _ctx, directory, pattern, offset, limit
+    )
+
+
+@mcp.tool()
+async def list_symbols(file_path: str) -> str:
     """
     List symbols in a specific file.
 
@@ -70,11 +113,15 @@ def list_symbols(file_path: str) -> str:
     Returns:
         Compact list of symbols with their types and key attributes.
     """
-    return list_symbols_tool(_ctx, file_path)
+    from paradox_script_mcp.tools.symbols import list_symbols_tool
+
+    return await to_thread.run_sync(list_symbols_tool, _ctx, file_path)
 
 
 @mcp.tool()
-def get_structure(file_path: str, symbol: str, key_path: str | None = None) -> str:
+async def get_structure(
+    file_path: str, symbol: str, key_path: str | None = None
+) -> str:
     """
     Get the structure of a symbol (keys only, no full content).
 
@@ -94,16 +141,112 @@ def get_structure(file_path: str, symbol: str, key_path: str | None = None) -> s
         Compact structure showing keys and value types.
         Block values show "[block]" instead of full content.
     """
-    return get_structure_tool(_ctx, file_path, symbol, key_path)
+    from paradox_script_mcp.tools.structure import get_structure_tool
+
+    return await to_thread.run_sync(
+        get_structure_tool, _ctx, file_path, symbol, key_path
+    )
+
+
+@mcp.tool()
+async def corpus_stats(directory: str | None = None, top: int = 10) -> str:
+    """
+    Aggregate statistics over every script file in the known directories.
+
+    Runs in parallel over the whole corpus. Results are cached per file,
+    so re-running after an edit only re-parses the changed files.
+
+    Args:
+        directory: Optional path prefix to restrict the corpus
+                  (e.g., "common/national_focus")
+        top: Number of most frequent keys to show per directory
+
+    Returns:
+        Per-directory key frequencies, nesting depths,
+        largest blocks and files that failed to parse.
+    """
+    from paradox_script_mcp.tools.stats import corpus_stats_tool
 
+    return await to_thread.run_sync(corpus_stats_tool, _ctx, directory, top)
 
-# ASGI app for uvicorn (hot reload support)
-app = mcp.streamable_http_app()
+
+@mcp.tool()
+async def diff_versions(base: str, other: str | None = None, limit: int = 50) -> str:
+    """
+    Compare two game versions (installs, mods or snapshots) at symbol level.
+
+    Reports which focuses, events, decisions, etc. were added, removed
+    or modified, and which key paths changed inside modified symbols.
+    Uses persisted per-symbol hashes, so only changed files are re-parsed
+    and only mismatched subtrees are compared.
+
+    Args:
+        base: Game directory or snapshot name of the old version
+        other: Game directory or snapshot name of the new version
+              (default: the initialized game directory)
+        limit: Maximum number of files to list per section
+
+    Returns:
+        Changed files with added (+), removed (-) and modified (~) symbols.
+        Key paths can be passed to get_structure.
+    """
+    from paradox_script_mcp.tools.diff import diff_versions_tool
+
+    return await to_thread.run_sync(diff_versions_tool, _ctx, base, other, limit)
+
+
+@mcp.tool()
+async def snapshot_version(name: str, game_directory: str | None = None) -> str:
+    """
+    Save a named snapshot of a game version to compare against later.
+
+    Take a snapshot before a game patch or mod update, then pass its
+    name to diff_versions as the base. Snapshots are stored in the
+    server's cache directory.
+
+    Args:
+        name: Snapshot name (e.g., "hoi4-1.14"); letters, digits,
+              "_", "-" and "." only
+        game_directory: Game directory to snapshot
+                       (default: the initialized game directory)
+
+    Returns:
+        Snapshot name, file count and root hash.
+    """
+    from paradox_script_mcp.tools.diff import snapshot_version_tool
+
+    return await to_thread.run_sync(snapshot_version_tool, _ctx, name, game_directory)
+
+
+def __getattr__(name: str):
+    """
+    Build the ASGI app for uvicorn (hot reload support) on first access.
+
+    Deferred so the stdio transport never imports the HTTP stack.
+    """
+    if name == "app":
+        global app
+        app = mcp.streamable_http_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def main():
     """Main entry point for the MCP server"""
-    mcp.run(transport="streamable-http")
+    parser = argparse.ArgumentParser(prog="paradox-script-mcp")
+    parser.add_argument(
+        "--transport",
+        choices=["streamable-http", "stdio"],
+        default="streamable-http",
+        help="MCP transport (default: streamable-http)",
+    )
+    args = parser.parse_args()
+    mcp.run(transport=args.transport)
+
+
+def main_stdio():
+    """Entry point for a per-session server over stdio"""
+    mcp.run(transport="stdio")
 
 
 if __name__ == "__main__":
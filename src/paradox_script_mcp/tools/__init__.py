@@ -1,13 +1,36 @@
 """
 MCP Tools for Paradox Script exploration
+
+Tool functions are re-exported lazily, so the first call of one tool
+does not load every tool module (and its caches and indexes).
 """
 
-from paradox_script_mcp.tools.explore import list_directories_tool
-from paradox_script_mcp.tools.symbols import list_symbols_tool
-from paradox_script_mcp.tools.structure import get_structure_tool
+_TOOL_MODULES = {
+    "list_directories_tool": "explore",
+    "list_files_tool": "files",
+    "list_symbols_tool": "symbols",
+    "get_structure_tool": "structure",
+    "corpus_stats_tool": "stats",
+    "diff_versions_tool": "diff",
+    "snapshot_version_tool": "diff",
+}
 
 __all__ = [
     "list_directories_tool",
+    "list_files_tool",
     "list_symbols_tool",
     "get_structure_tool",
+    "corpus_stats_tool",
+    "diff_versions_tool",
+    "snapshot_version_tool",
 ]
+
+
+def __getattr__(name: str):
+    """Import a tool's module on first access"""
+    module = _TOOL_MODULES.get(name)
+    if module is not None:
+        import importlib
+
+        return getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,148 @@
+"""
+Version diff tools
+"""
+
+from pathlib import Path
+
+from paradox_script_mcp.core.game import GameContext
+from paradox_script_mcp.core.inventory import FileInventory
+from paradox_script_mcp.core.merkle import (
+    FileHashes,
+    MerkleSnapshot,
+    diff_snapshots,
+    load_or_build,
+    named_snapshot_path,
+)
+
+
+def diff_versions_tool(
+    ctx: GameContext, base: str, other: str | None = None, limit: int = 50
+) -> str:
+    """
+    Compare two game versions at symbol level
+
+    Args:
+        ctx: The game context
+        base: Game directory or snapshot name of the old version
+        other: Game directory or snapshot name of the new version
+              (default: the initialized game directory)
+        limit: Maximum number of files to list per section
+
+    Returns added, removed and modified symbols with changed key paths.
+    """
+    if not ctx.is_initialized:
+        return "Error: Game not initialized. Call init_game first."
+
+    try:
+        base_snapshot = _load_version(ctx, base)
+        other_snapshot = _load_version(ctx, other or str(ctx.game_directory))
+    except (OSError, ValueError, KeyError) as e:
+        return f"Error: {e}"
+
+    diff = diff_snapshots(base_snapshot, other_snapshot)
+
+    lines = [
+        f"Diff: {base_snapshot.root} ({base_snapshot.digest[:12]}) -> "
+        f"{other_snapshot.root} ({other_snapshot.digest[:12]})",
+        f"Files: {len(diff.added_files)} added, {len(diff.removed_files)} removed, "
+        f"{len(diff.modified_files)} modified, {diff.unchanged_files} unchanged",
+    ]
+    if base_snapshot.digest == other_snapshot.digest:
+        return "\n".join(lines)
+
+    for file_diff in diff.modified_files[:limit]:
+        lines.append(f"~ {file_diff.path}")
+        if file_diff.error:
+            lines.append(f"  parse error: {file_diff.error}")
+        for name in file_diff.added:
+            lines.append(f"  + {name}")
+        for name in file_diff.removed:
+            lines.append(f"  - {name}")
+        for name, key_paths in file_diff.modified:
+            if key_paths:
+                lines.append(f"  ~ {name}: {', '.join(key_paths)}")
+            else:
+                lines.append(f"  ~ {name}")
+    _append_truncated(lines, diff.modified_files, limit)
+
+    for rel_path, hashes in diff.added_files[:limit]:
+        lines.append(f"+ {rel_path} ({_summary(hashes)})")
+    _append_truncated(lines, diff.added_files, limit)
+
+    for rel_path, hashes in diff.removed_files[:limit]:
+        lines.append(f"- {rel_path} ({_summary(hashes)})")
+    _append_truncated(lines, diff.removed_files, limit)
+
+    return "\n".join(lines)
+
+
+def snapshot_version_tool(
+    ctx: GameContext, name: str, game_directory: str | None = None
+) -> str:
+    """
+    Save a named snapshot of a game version for later diffing
+
+    Snapshots are written under the cache directory, never to a
+    caller-chosen path.
+
+    Args:
+        ctx: The game context
+        name: Snapshot name (e.g., "hoi4-1.14")
+        game_directory: Game directory to snapshot
+                       (default: the initialized game directory)
+
+    Returns the snapshot's root hash and file count.
+    """
+    if not ctx.is_initialized:
+        return "Error: Game not initialized. Call init_game first."
+
+    try:
+        output_path = named_snapshot_path(name)
+    except ValueError as e:
+        return f"Error: {e}"
+
+    directory = game_directory or str(ctx.game_directory)
+    if not Path(directory).is_dir():
+        return f"Error: Not a directory: {directory}"
+
+    try:
+        snapshot = load_or_build(directory, _inventory_for(ctx, directory))
+        snapshot.save(output_path)
+    except OSError as e:
+        return f"Error saving snapshot: {e}"
+
+    return (
+        f"Snapshot: {name} ({len(snapshot.files)} files, root {snapshot.digest[:12]})"
+    )
+
+
+def _load_version(ctx: GameContext, spec: str) -> MerkleSnapshot:
+    """Load a named snapshot, or build/refresh one for a game directory"""
+    path = Path(spec)
+    if path.is_dir():
+        return load_or_build(path, _inventory_for(ctx, path))
+    try:
+        snapshot_file = named_snapshot_path(spec)
+    except ValueError:
+        snapshot_file = None
+    if snapshot_file is not None and snapshot_file.is_file():
+        return MerkleSnapshot.load(snapshot_file)
+    raise ValueError(f"Not a game directory or snapshot name: {spec}")
+
+
+def _inventory_for(ctx: GameContext, directory: Path | str) -> FileInventory | None:
+    """The context's inventory if directory is the initialized game directory"""
+    if Path(directory).resolve() == ctx.game_directory.resolve():
+        return ctx.inventory
+    return None
+
+
+def _summary(hashes: FileHashes) -> str:
+    if hashes.error:
+        return f"parse error: {hashes.error}"
+    return f"{len(hashes.symbols)} symbols"
+
+
+def _append_truncated(lines: list[str], items: list, limit: int) -> None:
+    if len(items) > limit:
+        lines.append(f"  ... {len(items) - limit} more files")
@@ -0,0 +1,70 @@
+"""
+File listing tool
+"""
+
+from paradox_script_mcp.core.game import GameContext
+
+# Maximum number of files returned per page
+MAX_LIMIT = 500
+
+
+def list_files_tool(
+    ctx: GameContext,
+    directory: str = "",
+    pattern: str | None = None,
+    offset: int = 0,
+    limit: int = 100,
+) -> str:
+    """
+    List files in a directory from the cached file inventory
+
+    Args:
+        ctx: The game context
+        directory: Relative directory to list (default: whole game directory)
+        pattern: Optional glob on file names (e.g., "*aat*.txt"),
+                or on relative paths if it contains "/"
+        offset: Number of matching files to skip
+        limit: Maximum number of files to return
+
+    Returns compact file listing for token efficiency.
+    """
+    if not ctx.is_initialized:
+        return "Error: Game not initialized. Call init_game first."
+
+    entries = ctx.inventory.find(directory, pattern)
+    target = directory.strip("/") or "."
+    if pattern:
+        target = f"{target} ({pattern})"
+    if not entries:
+        return f"No files found in {target}"
+
+    offset = max(0, offset)
+    limit = max(1, min(limit, MAX_LIMIT))
+    page = entries[offset : offset + limit]
+    if not page:
+        return f"No files at offset {offset} ({len(entries)} files in {target})"
+
+    end = offset + len(page)
+    header = f"Files {offset + 1}-{end} of {len(entries)} in {target}"
+    if end < len(entries):
+        header += f" (next: offset={end})"
+    lines = [header]
+
+    # Print each directory description once, when it changes
+    description: str | None = None
+    for entry in page:
+        if entry.description and entry.description != description:
+            lines.append(f"[{entry.description}]")
+        description = entry.description
+        lines.append(f"{entry.path} ({_format_size(entry.size)})")
+
+    return "\n".join(lines)
+
+
+def _format_size(size: int) -> str:
+    """Human-readable file size"""
+    if size < 1024:
+        return f"{size} B"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size / (1024 * 1024):.1f} MB"
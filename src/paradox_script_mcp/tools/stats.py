@@ -0,0 +1,242 @@
+"""
+Corpus statistics tool
+
+Map-reduce over every script file in the known directories.
+Per-file results are cached by file stamp, so re-running after
+an edit only re-parses the changed files.
+"""
+
+import heapq
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+from paradox_script_mcp.core.cache import FileStamp, file_stamp, register_cache
+from paradox_script_mcp.core.game import GameContext
+from paradox_script_mcp.core.workers import WorkerError, parse_pool
+from paradox_script_mcp.knowledge.directory_map import match_directory
+
+
+# Number of largest blocks kept per file and per directory
+LARGEST_BLOCKS = 5
+
+
+@dataclass
+class FileStats:
+    """Statistics collected from a single file (map result)"""
+
+    key_counts: Counter = field(default_factory=Counter)
+    max_depth: int = 0
+    blocks: int = 0
+    largest_blocks: list[tuple[int, str]] = field(default_factory=list)
+    error: str | None = None
+
+
+@dataclass
+class DirectoryStats:
+    """Statistics aggregated over a directory (reduce result)"""
+
+    files: int = 0
+    parsed: int = 0
+    key_counts: Counter = field(default_factory=Counter)
+    max_depth: int = 0
+    depth_total: int = 0
+    blocks: int = 0
+    largest_blocks: list[tuple[int, str]] = field(default_factory=list)
+    failures: list[tuple[str, str]] = field(default_factory=list)
+
+
+# Per-file results keyed by absolute path, valid while the stamp matches
+_file_stats_cache: dict[str, tuple[FileStamp, FileStats]] = {}
+register_cache(_file_stats_cache.clear)
+
+
+def corpus_stats_tool(
+    ctx: GameContext, directory: str | None = None, top: int = 10
+) -> str:
+    """
+    Aggregate statistics over the script corpus
+
+    Reports key frequencies, nesting depths, largest blocks and
+    parse failures for each known directory.
+
+    Args:
+        ctx: The game context
+        directory: Optional path prefix to restrict the corpus
+                  (e.g., "common/national_focus")
+        top: Number of most frequent keys to show per directory
+
+    Returns compact per-directory statistics.
+    """
+    if not ctx.is_initialized:
+        return "Error: Game not initialized. Call init_game first."
+
+    files = _collect_files(ctx, directory)
+    if not files:
+        target = directory or "known directories"
+        return f"No script files found in {target}"
+
+    # Split into cached results and files that need (re)computing
+    results: dict[str, FileStats] = {}
+    pending: list[tuple[str, FileStamp]] = []
+    for _, full_path in files:
+        stamp = file_stamp(full_path)
+        if stamp is None:
+            continue
+        cached = _file_stats_cache.get(full_path)
+        if cached and cached[0] == stamp:
+            results[full_path] = cached[1]
+        else:
+            pending.append((full_path, stamp))
+
+    computed = parse_pool().map(_collect_file_stats, [path for path, _ in pending])
+    for (path, stamp), stats in zip(pending, computed):
+        if isinstance(stats, WorkerError):
+            # Timeouts and crashes are not cached, so they are retried
+            results[path] = FileStats(error=str(stats))
+            continue
+        _file_stats_cache[path] = (stamp, stats)
+        results[path] = stats
+
+    # Reduce per known directory
+    per_directory: dict[str, DirectoryStats] = {}
+    for rel_path, full_path in files:
+        stats = results.get(full_path)
+        if stats is None:
+            continue
+        dir_key = match_directory(rel_path) or os.path.dirname(rel_path)
+        dir_stats = per_directory.setdefault(dir_key, DirectoryStats())
+        _merge_stats(dir_stats, rel_path, stats)
+
+    return _format_stats(per_directory, recomputed=len(pending), top=top)
+
+
+def _collect_files(ctx: GameContext, directory: str | None) -> list[tuple[str, str]]:
+    """
+    List script files in the known directories.
+
+    Served from the context's file inventory, so no directory walk.
+
+    Returns sorted (relative path, absolute path) tuples.
+    """
+    root = ctx.game_directory
+    return [
+        (entry.path, str(root / entry.path))
+        for entry in ctx.inventory.script_files(directory or "")
+    ]
+
+
+def _collect_file_stats(path: str) -> FileStats:
+    """Parse a single file and collect its statistics (runs in a worker)"""
+    from paradox_script.parser import parse_save_file
+
+    stats = FileStats()
+    try:
+        data = parse_save_file(path)
+    except Exception as e:
+        stats.error = _error_summary(e)
+        return stats
+
+    try:
+        _walk(data, "", 0, stats)
+    except RecursionError as e:
+        stats.error = _error_summary(e)
+    return stats
+
+
+def _walk(value: Any, path: str, depth: int, stats: FileStats) -> None:
+    """Recursively collect key counts, depths and block sizes"""
+    if hasattr(value, "_data"):
+        value = value._data
+
+    if isinstance(value, list):
+        for i, item in enumerate(value):
+            _walk(item, f"{path}[{i}]", depth, stats)
+        return
+
+    if not isinstance(value, dict):
+        return
+
+    # The file root is not a block of its own
+    if depth > 0:
+        stats.blocks += 1
+        stats.max_depth = max(stats.max_depth, depth)
+        _push_largest(stats.largest_blocks, (len(value), path))
+
+    for key, child in value.items():
+        child_data = child._data if hasattr(child, "_data") else child
+        # Repeated blocks (e.g. multiple "focus") count once per block
+        if isinstance(child_data, list) and any(
+            isinstance(getattr(item, "_data", item), dict) for item in child_data
+        ):
+            stats.key_counts[key] += len(child_data)
+        else:
+            stats.key_counts[key] += 1
+        _walk(child_data, f"{path}.{key}" if path else key, depth + 1, stats)
+
+
+def _push_largest(heap: list[tuple[int, str]], item: tuple[int, str]) -> None:
+    """Keep the LARGEST_BLOCKS largest items in a min-heap"""
+    if len(heap) < LARGEST_BLOCKS:
+        heapq.heappush(heap, item)
+    elif item > heap[0]:
+        heapq.heapreplace(heap, item)
+
+
+def _error_summary(e: Exception) -> str:
+    """Single-line, truncated error message"""
+    message = f"{type(e).__name__}: {e}".splitlines()[0]
+    if len(message) > 120:
+        return message[:117] + "..."
+    return message
+
+
+def _merge_stats(dir_stats: DirectoryStats, rel_path: str, stats: FileStats) -> None:
+    """Reduce a file's statistics into its directory"""
+    dir_stats.files += 1
+    if stats.error:
+        dir_stats.failures.append((rel_path, stats.error))
+        return
+
+    dir_stats.parsed += 1
+    dir_stats.key_counts.update(stats.key_counts)
+    dir_stats.max_depth = max(dir_stats.max_depth, stats.max_depth)
+    dir_stats.depth_total += stats.max_depth
+    dir_stats.blocks += stats.blocks
+    file_name = rel_path.rsplit("/", 1)[-1]
+    for count, key_path in stats.largest_blocks:
+        _push_largest(dir_stats.largest_blocks, (count, f"{file_name}:{key_path}"))
+
+
+def _format_stats(
+    per_directory: dict[str, DirectoryStats], recomputed: int, top: int
+) -> str:
+    """Format aggregated statistics compactly"""
+    total_files = sum(d.files for d in per_directory.values())
+    total_failed = sum(len(d.failures) for d in per_directory.values())
+    lines = [
+        f"Corpus: {total_files} files, {total_failed} failed ({recomputed} recomputed)"
+    ]
+
+    for dir_path, d in sorted(per_directory.items()):
+        lines.append("")
+        lines.append(
+            f"{dir_path}/ ({d.files} files, {d.blocks} blocks, {len(d.failures)} failed)"
+        )
+        if d.parsed:
+            avg_depth = d.depth_total / d.parsed
+            lines.append(f"  depth: max {d.max_depth}, avg {avg_depth:.1f}")
+        if d.key_counts:
+            keys = ", ".join(f"{k}={n}" for k, n in d.key_counts.most_common(top))
+            lines.append(f"  keys: {keys}")
+        if d.largest_blocks:
+            largest = ", ".join(
+                f"{path} ({count} keys)"
+                for count, path in sorted(d.largest_blocks, reverse=True)
+            )
+            lines.append(f"  largest: {largest}")
+        for rel_path, error in d.failures:
+            lines.append(f"  failed: {rel_path}: {error}")
+
+    return "\n".join(lines)
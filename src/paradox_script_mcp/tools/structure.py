@@ -5,15 +5,16 @@ Structure inspection tool
 import re
 from typing import Any
 
-from paradox_script.parser import parse_save_file
-
+from paradox_script_mcp.core.cache import cached_response
 from paradox_script_mcp.core.game import GameContext
+from paradox_script_mcp.core.workers import WorkerError, parse_pool
 
 
 # Depth threshold: beyond this level, expand full content
 EXPAND_DEPTH_THRESHOLD = 2
 
 
+@cached_response("get_structure")
 def get_structure_tool(
     ctx: GameContext, file_path: str, symbol: str, key_path: str | None = None
 ) -> str:
@@ -43,10 +44,21 @@ def get_structure_tool(
         return f"Error: File not found: {file_path}"
 
     try:
-        data = parse_save_file(str(full_path))
-    except Exception as e:
+        return parse_pool().run(
+            _render_structure, str(full_path), file_path, symbol, key_path
+        )
+    except WorkerError as e:
         return f"Error parsing {file_path}: {e}"
 
+
+def _render_structure(
+    path: str, file_path: str, symbol: str, key_path: str | None
+) -> str:
+    """Parse a file and format a symbol's structure (runs in a parse worker)"""
+    from paradox_script.parser import parse_save_file
+
+    data = parse_save_file(path)
+
     # Find the symbol block
     block = _find_symbol_block(data, symbol)
     if block is None:
@@ -2,11 +2,12 @@
 Symbol listing tool
 """
 
-from paradox_script.parser import parse_save_file
-
+from paradox_script_mcp.core.cache import cached_response
 from paradox_script_mcp.core.game import GameContext
+from paradox_script_mcp.core.workers import WorkerError, parse_pool
 
 
+@cached_response("list_symbols")
 def list_symbols_tool(ctx: GameContext, file_path: str) -> str:
     """
     List symbols in a file (top level only)
@@ -25,10 +26,17 @@ def list_symbols_tool(ctx: GameContext, file_path: str) -> str:
         return f"Error: File not found: {file_path}"
 
     try:
-        data = parse_save_file(str(full_path))
-    except Exception as e:
+        return parse_pool().run(_render_symbols, str(full_path), file_path)
+    except WorkerError as e:
         return f"Error parsing {file_path}: {e}"
 
+
+def _render_symbols(path: str, file_path: str) -> str:
+    """Parse a file and format its symbols (runs in a parse worker)"""
+    from paradox_script.parser import parse_save_file
+
+    data = parse_save_file(path)
+
     raw_data = data._data if hasattr(data, "_data") else data
     if not isinstance(raw_data, dict):
         return f"Error: Expected dict, got {type(raw_data).__name__}"
@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture
+def anyio_backend():
+    # FastMCP serves on asyncio
+    return "asyncio"
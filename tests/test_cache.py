@@ -0,0 +1,70 @@
+"""
+Tests for file stamps and the response cache
+"""
+
+import pytest
+
+from paradox_script_mcp.core.cache import cached_response, clear_caches
+from paradox_script_mcp.core.game import GameContext
+
+
+@pytest.fixture
+def ctx(tmp_path):
+    (tmp_path / "events").mkdir()
+    (tmp_path / "events" / "a.txt").write_text("a = 1\n")
+    ctx = GameContext()
+    ctx.initialize(str(tmp_path))
+    yield ctx
+    clear_caches()
+
+
+def counting_tool(response: str):
+    calls = []
+
+    @cached_response(f"test_{id(calls)}")
+    def tool(ctx, file_path, *args):
+        calls.append(args)
+        return response
+
+    return tool, calls
+
+
+def test_response_is_cached_per_stamp(ctx):
+    tool, calls = counting_tool("ok")
+    assert tool(ctx, "events/a.txt") == "ok"
+    assert tool(ctx, "events/a.txt") == "ok"
+    assert len(calls) == 1
+
+    (ctx.game_directory / "events" / "a.txt").write_text("a = 2\nb = 3\n")
+    tool(ctx, "events/a.txt")
+    assert len(calls) == 2
+
+
+def test_arguments_are_part_of_the_key(ctx):
+    tool, calls = counting_tool("ok")
+    tool(ctx, "events/a.txt", "x")
+    tool(ctx, "events/a.txt", "y")
+    assert calls == [("x",), ("y",)]
+
+
+def test_error_responses_are_not_cached(ctx):
+    tool, calls = counting_tool("Error parsing events/a.txt: Timed out after 30s")
+    tool(ctx, "events/a.txt")
+    tool(ctx, "events/a.txt")
+    assert len(calls) == 2
+
+
+def test_keyword_and_default_arguments_share_entry(ctx):
+    calls = []
+
+    @cached_response("test_structure")
+    def tool(ctx, file_path, symbol, key_path=None):
+        calls.append((symbol, key_path))
+        return f"{symbol}.{key_path}"
+
+    assert tool(ctx, "events/a.txt", "japan.1") == "japan.1.None"
+    assert tool(ctx, "events/a.txt", "japan.1", None) == "japan.1.None"
+    assert tool(ctx, "events/a.txt", symbol="japan.1", key_path=None) == "japan.1.None"
+    assert tool(ctx, "events/a.txt", "japan.1", key_path="option") == "japan.1.option"
+    assert tool(ctx, "events/a.txt", "japan.1", "option") == "japan.1.option"
+    assert calls == [("japan.1", None), ("japan.1", "option")]
@@ -0,0 +1,52 @@
+"""
+Tests for the game context
+"""
+
+import pytest
+
+from paradox_script_mcp.core.cache import clear_caches
+from paradox_script_mcp.core.game import GameContext
+
+
+@pytest.fixture
+def game(tmp_path):
+    (tmp_path / "events").mkdir()
+    (tmp_path / "events" / "a.txt").write_text("a = 1\n")
+    yield tmp_path
+    clear_caches()
+
+
+def test_reinitialize_keeps_inventory(game):
+    ctx = GameContext()
+    ctx.initialize(str(game))
+    inventory = ctx.inventory
+
+    ctx.initialize(str(game))
+    assert ctx.inventory is inventory
+
+
+def test_rescan_sees_new_files(game):
+    ctx = GameContext()
+    ctx.initialize(str(game))
+    assert len(ctx.inventory) == 1
+
+    (game / "events" / "b.txt").write_text("b = 1\n")
+    ctx.initialize(str(game))
+    assert len(ctx.inventory) == 1
+    ctx.initialize(str(game), rescan=True)
+    assert len(ctx.inventory) == 2
+
+
+def test_new_directory_clears_inventory(game, tmp_path_factory):
+    other = tmp_path_factory.mktemp("other")
+    ctx = GameContext()
+    ctx.initialize(str(game))
+    assert len(ctx.inventory) == 1
+
+    ctx.initialize(str(other))
+    assert len(ctx.inventory) == 0
+
+
+def test_initialize_rejects_missing_directory(tmp_path):
+    with pytest.raises(ValueError, match="not found"):
+        GameContext().initialize(str(tmp_path / "missing"))
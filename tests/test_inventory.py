@@ -0,0 +1,93 @@
+"""
+Tests for the file inventory and directory matching
+"""
+
+import pytest
+
+from paradox_script_mcp.core.inventory import FileEntry, FileInventory
+from paradox_script_mcp.knowledge.directory_map import (
+    DirectoryKnowledge,
+    _PathTrie,
+)
+
+
+def inventory(*paths: str) -> FileInventory:
+    return FileInventory([FileEntry(path, 1, None) for path in paths])
+
+
+def paths(entries: list[FileEntry]) -> list[str]:
+    return [e.path for e in entries]
+
+
+def test_find_lists_directory_contents():
+    inv = inventory("events/a.txt", "events/sub/b.txt", "history/c.txt")
+    assert paths(inv.find("events")) == ["events/a.txt", "events/sub/b.txt"]
+    assert paths(inv.find("events/")) == ["events/a.txt", "events/sub/b.txt"]
+    assert len(inv.find()) == 3
+
+
+def test_find_exact_file_lists_itself():
+    inv = inventory("common/foo.txt", "common/foo.txt.bak")
+    assert paths(inv.find("common/foo.txt")) == ["common/foo.txt"]
+
+
+def test_find_excludes_siblings_sorting_next_to_directory():
+    # "-" and "." sort before "/", "0" right after it
+    inv = inventory(
+        "common/foo-bar.txt",
+        "common/foo.txt",
+        "common/foo/x.txt",
+        "common/foo0.txt",
+        "common/foo_baz/y.txt",
+    )
+    assert paths(inv.find("common/foo")) == ["common/foo/x.txt"]
+
+
+def test_find_pattern_on_name_or_path():
+    inv = inventory("events/aat.txt", "events/sub/aat_b.txt", "events/x.gui")
+    assert paths(inv.find("events", "*aat*.txt")) == [
+        "events/aat.txt",
+        "events/sub/aat_b.txt",
+    ]
+    assert paths(inv.find("events", "events/*/*.txt")) == ["events/sub/aat_b.txt"]
+
+
+def test_build_scans_tree(tmp_path):
+    (tmp_path / "events" / "sub").mkdir(parents=True)
+    (tmp_path / "events" / "a.txt").write_text("a = 1\n")
+    (tmp_path / "events" / "sub" / "b.txt").write_text("b = 22\n")
+    inv = FileInventory.build(tmp_path, workers=2)
+    assert [(e.path, e.size) for e in inv.find()] == [
+        ("events/a.txt", 6),
+        ("events/sub/b.txt", 7),
+    ]
+
+
+@pytest.fixture
+def trie():
+    trie = _PathTrie()
+    for path in ("events", "common/national_focus", "common"):
+        trie.insert(path)
+    return trie
+
+
+def test_trie_longest_prefix(trie):
+    assert trie.longest_prefix("common/national_focus/japan.txt") == (
+        "common/national_focus"
+    )
+    assert trie.longest_prefix("common/ideas/japan.txt") == "common"
+    assert trie.longest_prefix("events") == "events"
+    assert trie.longest_prefix("history/states/1.txt") is None
+
+
+def test_trie_matches_whole_segments(trie):
+    assert trie.longest_prefix("events_extra/foo.txt") is None
+    assert trie.longest_prefix("common_extra/foo.txt") is None
+
+
+def test_knowledge_match_normalizes_separators():
+    knowledge = DirectoryKnowledge()
+    knowledge.load("hoi4")
+    assert knowledge.match("events\\Japan.txt") == "events"
+    assert knowledge.match("events_extra/Japan.txt") is None
+    assert knowledge.get_info("events_extra/Japan.txt") is None
@@ -0,0 +1,290 @@
+"""
+Tests for block-level Merkle snapshots
+"""
+
+import os
+
+import pytest
+
+from paradox_script_mcp.core import merkle
+from paradox_script_mcp.core.inventory import FileInventory
+from paradox_script_mcp.core.merkle import (
+    FileHashes,
+    MerkleSnapshot,
+    SymbolHash,
+    build_snapshot,
+    diff_snapshots,
+)
+from paradox_script_mcp.core.workers import WorkerError
+from paradox_script_mcp.knowledge.directory_map import load_knowledge
+
+
+def symbol_names(raw_data: dict) -> list[str]:
+    names: dict[str, None] = {}
+    for name, _ in merkle._iter_symbols(raw_data):
+        names[merkle._unique_name(names, name)] = None
+    return list(names)
+
+
+def test_symbols_named_by_id_or_indexed_key():
+    raw_data = {
+        "add_namespace": "japan",
+        "country_event": [{"id": "japan.1"}, {"id": "japan.2"}],
+        "on_startup": [{"effect": 1}, {"effect": 2}],
+    }
+    assert symbol_names(raw_data) == [
+        "add_namespace",
+        "japan.1",
+        "japan.2",
+        "on_startup[0]",
+        "on_startup[1]",
+    ]
+
+
+def test_duplicate_symbols_get_suffix():
+    raw_data = {
+        "country_event": [{"id": "japan.1"}, {"id": "japan.1"}, {"id": "japan.1"}]
+    }
+    assert symbol_names(raw_data) == ["japan.1", "japan.1#2", "japan.1#3"]
+
+
+def test_focuses_split_from_focus_tree():
+    raw_data = {
+        "focus_tree": {
+            "id": "japan_focus",
+            "country": {"factor": 0},
+            "focus": [{"id": "JAP_a", "cost": 10}, {"id": "JAP_b", "cost": 5}],
+        }
+    }
+    symbols = list(merkle._iter_symbols(raw_data))
+    assert [name for name, _ in symbols] == ["japan_focus", "JAP_a", "JAP_b"]
+    # The tree's own hash excludes its focuses
+    assert "focus" not in symbols[0][1]
+
+
+def test_changed_key_paths_keeps_most_specific():
+    a = {"reward": "1", "reward.add_stability": "1", "reward.add_pp": "1", "cost": "1"}
+    b = {"reward": "2", "reward.add_stability": "2", "reward.add_pp": "1", "cost": "1"}
+    b["bypass"] = "1"
+    assert merkle._changed_key_paths(a, b) == ["bypass", "reward.add_stability"]
+
+
+def test_key_path_hashes_locate_change():
+    old: dict[str, str] = {}
+    new: dict[str, str] = {}
+    merkle._hash_node({"cost": 10, "reward": {"add_stability": 0.1}}, "", 0, old)
+    merkle._hash_node({"cost": 10.0, "reward": {"add_stability": 0.2}}, "", 0, new)
+    # 10 and 10.0 hash alike
+    assert merkle._changed_key_paths(old, new) == ["reward.add_stability"]
+
+
+def file_hashes(size: int, **symbols: str) -> FileHashes:
+    return FileHashes(
+        stamp=f"stamp{size}",
+        digest=merkle._combine(sorted(symbols.items())),
+        symbols={name: SymbolHash(digest) for name, digest in symbols.items()},
+    )
+
+
+def test_snapshot_save_load_round_trip(tmp_path):
+    snapshot = MerkleSnapshot(
+        "/game",
+        {
+            "events/a.txt": file_hashes(10, **{"japan.1": "aa", "japan.2": "bb"}),
+            "common/national_focus/japan.txt": FileHashes(
+                stamp="stamp20",
+                digest="cc",
+                symbols={"JAP_a": SymbolHash("dd", {"cost": "ee"})},
+                error=None,
+            ),
+        },
+    )
+    path = tmp_path / "snapshots" / "v1.json"
+    snapshot.save(path)
+    loaded = MerkleSnapshot.load(path)
+
+    assert loaded.root == "/game"
+    assert loaded.files == snapshot.files
+    assert loaded.digest == snapshot.digest
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "other.json"
+    path.write_text('{"format": 0}')
+    with pytest.raises(ValueError):
+        MerkleSnapshot.load(path)
+
+
+def test_diff_reports_added_removed_and_modified():
+    base = MerkleSnapshot(
+        "/old",
+        {
+            "events/a.txt": file_hashes(1, **{"japan.1": "aa", "japan.2": "bb"}),
+            "events/b.txt": file_hashes(1, **{"b.1": "aa"}),
+            "events/c.txt": file_hashes(1, **{"c.1": "aa"}),
+        },
+    )
+    other = MerkleSnapshot(
+        "/new",
+        {
+            "events/a.txt": file_hashes(1, **{"japan.1": "ab", "japan.3": "cc"}),
+            "events/b.txt": file_hashes(1, **{"b.1": "aa"}),
+            "events/d.txt": file_hashes(1, **{"d.1": "aa"}),
+        },
+    )
+    diff = diff_snapshots(base, other)
+
+    assert [path for path, _ in diff.added_files] == ["events/d.txt"]
+    assert [path for path, _ in diff.removed_files] == ["events/c.txt"]
+    assert diff.unchanged_files == 1
+    [file_diff] = diff.modified_files
+    assert file_diff.path == "events/a.txt"
+    assert file_diff.added == ["japan.3"]
+    assert file_diff.removed == ["japan.2"]
+    assert [name for name, _ in file_diff.modified] == ["japan.1"]
+
+
+class FakePool:
+    """Stands in for the parse pool and records which files are hashed"""
+
+    def __init__(self):
+        self.hashed: list[str] = []
+        self.failing: set[str] = set()
+
+    def map(self, fn, paths):
+        for path in paths:
+            self.hashed.append(path)
+            if path in self.failing:
+                yield WorkerError("Timed out after 30s")
+                continue
+            with open(path) as f:
+                yield merkle._combine([("content", f.read())]), {}, None
+
+
+@pytest.fixture
+def game(tmp_path, monkeypatch):
+    load_knowledge("hoi4")
+    (tmp_path / "events").mkdir()
+    for name in ("a.txt", "b.txt"):
+        (tmp_path / "events" / name).write_text("x = 1\n")
+    # Not in a known directory, so not hashed
+    (tmp_path / "readme.txt").write_text("hello\n")
+
+    pool = FakePool()
+    monkeypatch.setattr(merkle, "parse_pool", lambda: pool)
+    return tmp_path, pool
+
+
+def test_unchanged_snapshot_is_reused(game):
+    root, pool = game
+    first = build_snapshot(root)
+    assert sorted(pool.hashed) == [
+        os.path.join(str(root), "events/a.txt"),
+        os.path.join(str(root), "events/b.txt"),
+    ]
+
+    pool.hashed.clear()
+    assert build_snapshot(root, first) is first
+    assert pool.hashed == []
+
+
+def test_only_changed_files_are_rehashed(game):
+    root, pool = game
+    first = build_snapshot(root)
+    pool.hashed.clear()
+
+    (root / "events" / "b.txt").write_text("x = 2\ny = 3\n")
+    second = build_snapshot(root, first)
+
+    assert pool.hashed == [os.path.join(str(root), "events/b.txt")]
+    assert second.files["events/a.txt"] is first.files["events/a.txt"]
+    assert second.digest != first.digest
+
+
+def test_persisted_snapshot_is_reused(game, tmp_path_factory, monkeypatch):
+    root, pool = game
+    monkeypatch.setenv(
+        "PARADOX_SCRIPT_MCP_CACHE_DIR", str(tmp_path_factory.mktemp("cache"))
+    )
+    monkeypatch.setattr(merkle, "_snapshots", {})
+    first = merkle.load_or_build(root)
+    pool.hashed.clear()
+
+    # A new process starts from the persisted snapshot
+    merkle._snapshots.clear()
+    second = merkle.load_or_build(root)
+    assert pool.hashed == []
+    assert second.digest == first.digest
+
+
+@pytest.mark.parametrize("name", ["", "..", ".hidden", "../x", "a/b", "a\\b", "/etc/x"])
+def test_named_snapshot_rejects_paths(name):
+    with pytest.raises(ValueError, match="Invalid snapshot name"):
+        merkle.named_snapshot_path(name)
+
+
+def test_named_snapshot_under_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("PARADOX_SCRIPT_MCP_CACHE_DIR", str(tmp_path))
+    path = merkle.named_snapshot_path("hoi4-1.14")
+    assert path == tmp_path / "snapshots" / "hoi4-1.14.json"
+
+
+def test_same_size_edit_within_mtime_tick_is_rehashed(game):
+    root, pool = game
+    path = root / "events" / "b.txt"
+    first = build_snapshot(root)
+    pool.hashed.clear()
+
+    st = path.stat()
+    path.write_text("x = 9\n")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    second = build_snapshot(root, first)
+
+    assert pool.hashed == [str(path)]
+    assert second.digest != first.digest
+
+
+def test_given_inventory_is_not_rescanned(game, monkeypatch):
+    root, pool = game
+    inventory = FileInventory.build(root)
+
+    def no_scan(*args, **kwargs):
+        raise AssertionError("directory rescanned")
+
+    monkeypatch.setattr(FileInventory, "build", no_scan)
+    snapshot = build_snapshot(root, inventory=inventory)
+    assert sorted(snapshot.files) == ["events/a.txt", "events/b.txt"]
+
+
+def test_worker_error_is_retried(game):
+    root, pool = game
+    path = str(root / "events" / "b.txt")
+    pool.failing.add(path)
+    first = build_snapshot(root)
+    assert first.files["events/b.txt"].stamp is None
+    assert first.files["events/b.txt"].error == "Timed out after 30s"
+
+    pool.failing.clear()
+    pool.hashed.clear()
+    second = build_snapshot(root, first)
+    assert pool.hashed == [path]
+    assert second.files["events/b.txt"].error is None
+
+
+def test_worker_error_keeps_previous_hashes(game):
+    root, pool = game
+    path = root / "events" / "b.txt"
+    first = build_snapshot(root)
+
+    path.write_text("x = 2\ny = 3\n")
+    pool.failing.add(str(path))
+    second = build_snapshot(root, first)
+    assert second.files["events/b.txt"].digest == first.files["events/b.txt"].digest
+    assert second.files["events/b.txt"].stamp is None
+    assert diff_snapshots(first, second).modified_files == []
+
+    pool.failing.clear()
+    pool.hashed.clear()
+    third = build_snapshot(root, second)
+    assert pool.hashed == [str(path)]
+    assert third.digest != first.digest
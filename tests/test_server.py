@@ -0,0 +1,55 @@
+"""
+Tests for the MCP tool wrappers
+"""
+
+import os
+import subprocess
+import sys
+import threading
+
+import anyio
+import pytest
+
+from paradox_script_mcp import server
+from paradox_script_mcp.tools import symbols
+
+
+@pytest.mark.anyio
+async def test_cheap_tool_returns_while_parse_is_stuck(monkeypatch):
+    release = threading.Event()
+    finished = threading.Event()
+
+    def stuck_list_symbols(ctx, file_path):
+        # Stands in for a parse waiting on a hung worker
+        release.wait(timeout=5)
+        finished.set()
+        return "done"
+
+    monkeypatch.setattr(symbols, "list_symbols_tool", stuck_list_symbols)
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(server.mcp.call_tool, "list_symbols", {"file_path": "a.txt"})
+        await anyio.sleep(0.1)
+        try:
+            await server.mcp.call_tool("list_directories", {})
+            assert not finished.is_set()
+        finally:
+            release.set()
+    assert finished.is_set()
+
+
+def test_tool_modules_load_separately():
+    program = (
+        "import sys\n"
+        "import paradox_script_mcp.tools.explore\n"
+        "print(sorted(m for m in sys.modules if m.startswith('paradox_script_mcp')))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", program],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)),
+    )
+    for module in ("tools.stats", "tools.diff", "core.merkle", "core.workers"):
+        assert f"paradox_script_mcp.{module}" not in result.stdout
@@ -0,0 +1,158 @@
+"""
+Tests for corpus statistics
+"""
+
+import json
+
+import pytest
+
+from paradox_script_mcp.core.cache import clear_caches
+from paradox_script_mcp.core.game import GameContext
+from paradox_script_mcp.core.workers import WorkerError
+from paradox_script_mcp.tools import stats
+from paradox_script_mcp.tools.stats import (
+    DirectoryStats,
+    FileStats,
+    corpus_stats_tool,
+)
+
+
+FOCUS_TREE = {
+    "focus_tree": {
+        "id": "japan_focus",
+        "focus": [
+            {"id": "JAP_a", "cost": 10, "completion_reward": {"add_stability": 0.1}},
+            {"id": "JAP_b", "cost": 5},
+        ],
+    }
+}
+
+
+def walk(data: dict) -> FileStats:
+    file_stats = FileStats()
+    stats._walk(data, "", 0, file_stats)
+    return file_stats
+
+
+def test_walk_counts_repeated_blocks_once_each():
+    file_stats = walk(FOCUS_TREE)
+    assert file_stats.key_counts["focus"] == 2
+    assert file_stats.key_counts["id"] == 3
+    assert file_stats.key_counts["cost"] == 2
+    assert file_stats.key_counts["focus_tree"] == 1
+
+
+def test_walk_tracks_depth_and_largest_blocks():
+    file_stats = walk(FOCUS_TREE)
+    # focus_tree, 2 focuses, completion_reward
+    assert file_stats.blocks == 4
+    assert file_stats.max_depth == 3
+    assert max(file_stats.largest_blocks) == (3, "focus_tree.focus[0]")
+
+
+def test_largest_blocks_are_bounded():
+    data = {f"block_{i}": {str(k): k for k in range(i + 1)} for i in range(10)}
+    file_stats = walk(data)
+    assert sorted(file_stats.largest_blocks, reverse=True) == [
+        (10, "block_9"),
+        (9, "block_8"),
+        (8, "block_7"),
+        (7, "block_6"),
+        (6, "block_5"),
+    ]
+
+
+def test_merge_stats_reduces_files_and_failures():
+    dir_stats = DirectoryStats()
+    stats._merge_stats(dir_stats, "common/national_focus/japan.txt", walk(FOCUS_TREE))
+    stats._merge_stats(
+        dir_stats, "common/national_focus/usa.txt", walk({"a": {"b": 1}})
+    )
+    stats._merge_stats(
+        dir_stats, "common/national_focus/bad.txt", FileStats(error="ParseError: x")
+    )
+
+    assert dir_stats.files == 3
+    assert dir_stats.parsed == 2
+    assert dir_stats.max_depth == 3
+    assert dir_stats.depth_total == 4
+    assert dir_stats.blocks == 5
+    assert dir_stats.key_counts["focus"] == 2
+    assert dir_stats.failures == [("common/national_focus/bad.txt", "ParseError: x")]
+    assert max(dir_stats.largest_blocks) == (3, "japan.txt:focus_tree.focus[0]")
+
+
+class FakePool:
+    """Stands in for the parse pool: files hold JSON instead of script"""
+
+    def __init__(self):
+        self.parsed: list[str] = []
+        self.failing: set[str] = set()
+
+    def map(self, fn, paths):
+        for path in paths:
+            self.parsed.append(path)
+            if path in self.failing:
+                yield WorkerError("Timed out after 30s")
+                continue
+            with open(path) as f:
+                data = json.load(f)
+            if "error" in data:
+                yield FileStats(error=data["error"])
+            else:
+                yield walk(data)
+
+
+@pytest.fixture
+def game(tmp_path, monkeypatch):
+    focus_dir = tmp_path / "common" / "national_focus"
+    focus_dir.mkdir(parents=True)
+    (focus_dir / "japan.txt").write_text(json.dumps(FOCUS_TREE))
+    (focus_dir / "bad.txt").write_text(json.dumps({"error": "ParseError: line 3"}))
+    (tmp_path / "events").mkdir()
+    (tmp_path / "events" / "japan.txt").write_text(json.dumps({"a": {"b": 1}}))
+
+    ctx = GameContext()
+    ctx.initialize(str(tmp_path))
+    pool = FakePool()
+    monkeypatch.setattr(stats, "parse_pool", lambda: pool)
+    yield ctx, pool
+    clear_caches()
+
+
+def test_corpus_stats_reports_per_directory(game):
+    ctx, pool = game
+    result = corpus_stats_tool(ctx)
+
+    assert result.startswith("Corpus: 3 files, 1 failed (3 recomputed)")
+    assert "common/national_focus/ (2 files, 4 blocks, 1 failed)" in result
+    assert "events/ (1 files, 1 blocks, 0 failed)" in result
+    assert "failed: common/national_focus/bad.txt: ParseError: line 3" in result
+
+
+def test_only_changed_files_are_recomputed(game):
+    ctx, pool = game
+    corpus_stats_tool(ctx)
+    pool.parsed.clear()
+
+    path = ctx.game_directory / "events" / "japan.txt"
+    path.write_text(json.dumps({"a": {"b": 1}, "c": {"d": 2}}))
+    result = corpus_stats_tool(ctx)
+
+    assert pool.parsed == [str(path)]
+    assert "(1 recomputed)" in result
+    assert "events/ (1 files, 2 blocks, 0 failed)" in result
+
+
+def test_worker_errors_are_retried(game):
+    ctx, pool = game
+    path = str(ctx.game_directory / "events" / "japan.txt")
+    pool.failing.add(path)
+    result = corpus_stats_tool(ctx)
+    assert "failed: events/japan.txt: Timed out after 30s" in result
+
+    pool.failing.clear()
+    pool.parsed.clear()
+    result = corpus_stats_tool(ctx, "events")
+    assert pool.parsed == [path]
+    assert "Corpus: 1 files, 0 failed (1 recomputed)" in result
@@ -0,0 +1,148 @@
+"""
+Tests for the supervised parse workers
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from paradox_script_mcp.core.workers import (
+    QUARANTINE_STRIKES,
+    ParsePool,
+    QuarantinedError,
+    WorkerError,
+)
+
+
+# Tasks must be module-level so workers can unpickle them
+
+
+def echo(path: str, suffix: str = "") -> str:
+    return os.path.basename(path) + suffix
+
+
+def hang(path: str) -> None:
+    with open(path + ".pid", "w") as f:
+        f.write(str(os.getpid()))
+    time.sleep(60)
+
+
+def crash(path: str) -> None:
+    os._exit(3)
+
+
+def fail(path: str) -> None:
+    raise ValueError("bad script")
+
+
+def fail_on_b(path: str) -> str:
+    if os.path.basename(path).startswith("b"):
+        fail(path)
+    return echo(path)
+
+
+def hog(path: str) -> bytes:
+    return bytearray(512 * 1024**2)
+
+
+@pytest.fixture
+def script(tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_text("a = 1\n")
+    return path
+
+
+@pytest.fixture
+def pool():
+    pool = ParsePool(size=1, timeout=1, memory_limit=256 * 1024**2)
+    yield pool
+    pool.shutdown()
+
+
+def test_run_returns_result(pool, script):
+    assert pool.run(echo, str(script), "!") == "a.txt!"
+
+
+def test_timeout_kills_worker(pool, script):
+    with pytest.raises(WorkerError, match="Timed out after 1s"):
+        pool.run(hang, str(script))
+
+    pid = int((script.parent / "a.txt.pid").read_text())
+    with pytest.raises(ProcessLookupError):
+        os.kill(pid, 0)
+    # A fresh worker takes the next task
+    assert pool.run(echo, str(script)) == "a.txt"
+
+
+def test_crash_becomes_worker_error(pool, script):
+    with pytest.raises(WorkerError, match=r"Worker crashed \(exit code 3\)"):
+        pool.run(crash, str(script))
+    assert pool.run(echo, str(script)) == "a.txt"
+
+
+def test_memory_limit_is_fatal(pool, script):
+    with pytest.raises(WorkerError, match="MemoryError"):
+        pool.run(hog, str(script))
+    assert pool.run(echo, str(script)) == "a.txt"
+
+
+def test_quarantine_after_strikes(pool, script):
+    for _ in range(QUARANTINE_STRIKES):
+        with pytest.raises(WorkerError, match="ValueError: bad script"):
+            pool.run(fail, str(script))
+
+    with pytest.raises(QuarantinedError):
+        pool.run(echo, str(script))
+    assert pool.quarantined() == [(str(script), "ValueError: bad script")]
+
+
+def test_quarantine_cleared_when_file_changes(pool, script):
+    for _ in range(QUARANTINE_STRIKES):
+        with pytest.raises(WorkerError):
+            pool.run(fail, str(script))
+
+    script.write_text("a = 2\nb = 3\n")
+    assert pool.run(echo, str(script)) == "a.txt"
+    assert pool.quarantined() == []
+
+
+def test_map_yields_errors_in_order(pool, tmp_path):
+    paths = []
+    for name in ("a.txt", "b.txt", "c.txt"):
+        path = tmp_path / name
+        path.write_text("x = 1\n")
+        paths.append(str(path))
+
+    results = list(pool.map(fail_on_b, paths))
+    assert results[0] == "a.txt"
+    assert isinstance(results[1], WorkerError)
+    assert results[2] == "c.txt"
+
+
+def noisy(path: str) -> str:
+    print("stray output")
+    return "ok"
+
+
+def test_worker_output_stays_off_stdout(script):
+    # stdout of a stdio server is the protocol stream
+    program = (
+        "import test_workers\n"
+        "from paradox_script_mcp.core.workers import ParsePool\n"
+        "pool = ParsePool(size=1)\n"
+        f"print(pool.run(test_workers.noisy, {str(script)!r}))\n"
+        "pool.shutdown()\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", program],
+        capture_output=True,
+        text=True,
+        timeout=30,
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)),
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == "ok\n"
+    assert "stray output" in result.stderr